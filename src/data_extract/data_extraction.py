@@ -1,23 +1,29 @@
 # src/data_extract/data_extraction.py
 
+import logging
 import pandas as pd
 import os
 import re
 import ast
 
+logger = logging.getLogger(__name__)
+
 
 class DataExtraction:
     @staticmethod
-    def read_raw_data(file_name):
-        """ Load the Excel file into a DataFrame. """
+    def get_dataset_file_path(file_name):
+        """ Path of a dataset file inside the project 'dataset' directory. """
         # Get the current working directory
         project_directory = os.getcwd()
 
         # Dataset path
         dataset_directory = os.path.join(project_directory, 'dataset')
-        file_name = os.path.join(dataset_directory, file_name)
+        return os.path.join(dataset_directory, file_name)
 
-        return pd.read_excel(file_name)
+    @staticmethod
+    def read_raw_data(file_name):
+        """ Load the Excel file into a DataFrame. """
+        return pd.read_excel(DataExtraction.get_dataset_file_path(file_name))
 
     @staticmethod
     def generate_review_dataframes(input_data):
@@ -35,7 +41,7 @@ class DataExtraction:
             """Process a single DataFrame and generate review information."""
             # Check if DataFrame is empty
             if df_name.empty:
-                print("Warning: DataFrame is empty.")
+                logger.warning("Warning: DataFrame is empty.")
                 return {
                     'Info Summary': pd.DataFrame(),
                     # 'Summary Statistics - Numerical': pd.DataFrame(),
@@ -105,7 +111,7 @@ class DataExtraction:
                 dict_str = '{' + dict_str + '}'  # ensure proper dictionary format for literal evaluatin
                 return ast.literal_eval(dict_str)
             except (ValueError, SyntaxError, TypeError) as e:
-                print(f"Error parsing method_dict: {e}")
+                logger.error("Error parsing method_dict: %s", e)
                 return {}
         else:
             # For value_dict and date_dict, use regex
@@ -0,0 +1,158 @@
+# src/data_load/columnar_store.py
+import json
+import logging
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class ColumnarStore:
+    """
+    Directory of typed `.npy` column files plus a `manifest.json`, built from the normalized tables.
+
+    One row per profile layer. Profile coordinates and method attributes are denormalized onto the layers, strings
+    are dictionary-encoded into int32 codes (-1 for missing) with the categories kept in the manifest. Columns
+    are opened with np.load(mmap_mode='r'), which gives zero-copy views shared between processes.
+    """
+
+    FORMAT_VERSION = 1
+    MANIFEST_FILE_NAME = 'manifest.json'
+
+    LAYER_COLUMNS = ['id', 'profile_layer_id', 'orgc_profile_id', 'upper_depth', 'lower_depth', 'layer_name',
+                     'litter', 'orgc_method_id', 'orgc_value', 'orgc_value_avg', 'orgc_date']
+    PROFILE_COLUMNS = ['profile_id', 'orgc_profile_code', 'orgc_dataset_id', 'latitude', 'longitude', 'country_name']
+    METHOD_COLUMNS = ['method_instance']
+    DATE_COLUMNS = ['orgc_date']
+    TEXT_COLUMNS = ['layer_name', 'orgc_profile_code', 'orgc_dataset_id', 'country_name']
+
+    @staticmethod
+    def _lookup(parent_df, parent_ids, column):
+        """ Gather `column` of parent_df for every id in parent_ids, NaN/None where the id is unknown. """
+        positions = pd.Index(parent_df['id']).get_indexer(parent_ids)
+        values = parent_df[column].to_numpy()[positions]
+        if (positions < 0).any():
+            values = values.astype('float64') if np.issubdtype(values.dtype, np.number) else values.astype(object)
+            values[positions < 0] = np.nan if values.dtype.kind == 'f' else None
+        return values
+
+    @staticmethod
+    def _encode_column(name, values):
+        """
+        Convert one column to a typed NumPy array. Returns (array, manifest entry).
+        """
+        if name in ColumnarStore.TEXT_COLUMNS:
+            codes, categories = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+            return codes.astype('int32'), {'encoding': 'dictionary', 'categories': [str(c) for c in categories]}
+
+        if name in ColumnarStore.DATE_COLUMNS:
+            dates = pd.to_datetime(pd.Series(values), format='%Y-%m-%d', errors='coerce')
+            return dates.to_numpy(dtype='datetime64[D]'), {'encoding': 'plain'}
+
+        numeric = pd.to_numeric(pd.Series(values), errors='coerce')
+        if pd.api.types.is_integer_dtype(numeric) and not numeric.isna().any():
+            return numeric.to_numpy(dtype='int64'), {'encoding': 'plain'}
+        # Integer columns with missing values (e.g. unmatched foreign keys) become float64, exact for the
+        # surrogate ids, which stay below 2**53
+        return numeric.to_numpy(dtype='float64', na_value=np.nan), {'encoding': 'plain'}
+
+    @staticmethod
+    def export_normalized(df_normalized_dict, directory):
+        """
+        Export the output of DataTransformNormalize.normalize_dataframes to a columnar directory.
+
+        Parameters:
+        df_normalized_dict (dict): {'orgc_method_df', 'orgc_profile_df', 'orgc_profile_layer_df'} DataFrames.
+        directory (str): Target directory, created if needed. Existing column files are overwritten.
+
+        Returns:
+        dict: The manifest written to `manifest.json`.
+        """
+        logger.info("\nExporting normalized tables to columnar store at '%s'...", directory)
+        layer_df = df_normalized_dict['orgc_profile_layer_df']
+        profile_df = df_normalized_dict['orgc_profile_df']
+        method_df = df_normalized_dict['orgc_method_df']
+
+        columns = {column: layer_df[column].to_numpy() for column in ColumnarStore.LAYER_COLUMNS}
+        profile_ids = layer_df['orgc_profile_id'].to_numpy()
+        method_ids = layer_df['orgc_method_id'].to_numpy()
+        for column in ColumnarStore.PROFILE_COLUMNS:
+            columns[column] = ColumnarStore._lookup(profile_df, profile_ids, column)
+        for column in ColumnarStore.METHOD_COLUMNS:
+            columns[column] = ColumnarStore._lookup(method_df, method_ids, column)
+
+        os.makedirs(directory, exist_ok=True)
+        # Remove the manifest first, a directory without manifest is never considered complete
+        manifest_path = os.path.join(directory, ColumnarStore.MANIFEST_FILE_NAME)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+
+        manifest = {
+            'format_version': ColumnarStore.FORMAT_VERSION,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'row_count': len(layer_df),
+            'columns': {}
+        }
+        for name, values in columns.items():
+            array, entry = ColumnarStore._encode_column(name, values)
+            file_name = f"{name}.npy"
+            np.save(os.path.join(directory, file_name), array, allow_pickle=False)
+            manifest['columns'][name] = {'file': file_name, 'dtype': str(array.dtype), **entry}
+
+        with open(manifest_path, 'w') as file:
+            json.dump(manifest, file, indent=2)
+
+        logger.info("Exported %s rows and %s columns.", manifest['row_count'], len(manifest['columns']))
+        return manifest
+
+    @staticmethod
+    def load(directory, columns=None):
+        """
+        Open a columnar store as read-only memory-mapped arrays.
+
+        Parameters:
+        directory (str): Directory written by export_normalized.
+        columns (list of str, optional): Columns to open. All columns if None.
+
+        Returns:
+        tuple: ({column_name: np.memmap}, manifest). Dictionary-encoded columns are returned as int32 codes,
+               use decode() with manifest['columns'][name]['categories'] to get the strings back.
+        """
+        manifest_path = os.path.join(directory, ColumnarStore.MANIFEST_FILE_NAME)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"No columnar store manifest found at '{manifest_path}'.")
+
+        with open(manifest_path, 'r') as file:
+            manifest = json.load(file)
+
+        if manifest.get('format_version') != ColumnarStore.FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar store format version: {manifest.get('format_version')}")
+
+        names = columns if columns is not None else list(manifest['columns'])
+        unknown = set(names) - set(manifest['columns'])
+        if unknown:
+            raise ValueError(f"Columns not found in columnar store: {unknown}")
+
+        arrays = {name: np.load(os.path.join(directory, manifest['columns'][name]['file']), mmap_mode='r')
+                  for name in names}
+        return arrays, manifest
+
+    @staticmethod
+    def decode(codes, categories):
+        """ Turn dictionary codes back into an object array of strings (None for code -1). """
+        lookup = np.array(list(categories) + [None], dtype=object)
+        return lookup[np.asarray(codes)]
+
+    @staticmethod
+    def load_dataframe(directory, columns=None):
+        """ Convenience loader returning a DataFrame with dictionary columns decoded. Copies the data. """
+        arrays, manifest = ColumnarStore.load(directory, columns)
+        data = {}
+        for name, array in arrays.items():
+            entry = manifest['columns'][name]
+            data[name] = ColumnarStore.decode(array, entry['categories']) \
+                if entry['encoding'] == 'dictionary' else np.asarray(array)
+        return pd.DataFrame(data)
@@ -1,12 +1,32 @@
 # src/data_load/data_loading.py
+import copy
+import hashlib
+import logging
 import os
 import re
 import sqlite3
+from functools import lru_cache
 
 import pandas as pd
 
+from src.data_preprocess_transform.data_depth_aggregate import DataDepthAggregate
+
+logger = logging.getLogger(__name__)
+
 
 class DataLoading:
+    DATA_VERSION_TABLE = 'etl_data_version'
+    AGGREGATE_TABLE = 'orgc_profile_soc_aggregate'
+    LOAD_STATE_TABLE = 'etl_load_state'
+
+    # pandas dtype used for each SQL column type in the casting plan
+    SQL_TYPE_TO_DTYPE = {
+        'INTEGER': 'Int64',
+        'REAL': 'float64',
+        'FLOAT': 'float64',
+        'TEXT': 'str',
+        'DATETIME': 'datetime64[ns]',
+    }
 
     @staticmethod
     def initialize_database(script_file_name, conn):
@@ -23,88 +43,128 @@ class DataLoading:
             cursor = conn.cursor()
             cursor.executescript(sql_script)
             conn.commit()
-            print("\nDatabase schema initialized successfully.")
+            logger.info("\nDatabase schema initialized successfully.")
             return sql_script
 
         except FileNotFoundError as fnf_error:
-            print(f"\nSQL script file not found: {fnf_error}")
+            logger.error("\nSQL script file not found: %s", fnf_error)
             raise
         except sqlite3.Error as db_error:
-            print(f"\nError initializing database schema: {db_error}")
+            logger.error("\nError initializing database schema: %s", db_error)
             raise
         except Exception as e:
-            print(f"\nUnexpected error initializing database schema: {e}")
+            logger.error("\nUnexpected error initializing database schema: %s", e)
             raise
 
     @staticmethod
     def parse_sql_schema(sql_script):
         """
         Parses the SQL script to extract table schema information.
+        The parse is cached per script text, repeated loads with the same script skip the regex work.
         """
         try:
-            schema = {}
-            create_table_regex = re.compile(r"CREATE TABLE IF NOT EXISTS (\w+)\s*\((.*?)\);", re.S)
-            foreign_key_regex = re.compile(r"FOREIGN KEY\s*\((\w+)\)\s*REFERENCES\s*(\w+)\((\w+)\)")
-            primary_key_regex = re.compile(r"PRIMARY KEY\s*\((.*?)\)")
-
-            tables = create_table_regex.findall(sql_script)
-
-            for table_name, table_definition in tables:
-                columns = {}
-                primary_keys = []
-                foreign_keys = []
-
-                for line in table_definition.splitlines():
-                    line = line.strip().strip(",")
-                    if line.startswith("FOREIGN KEY"):
-                        foreign_key_match = foreign_key_regex.search(line)
-                        if foreign_key_match:
-                            fk_column, ref_table, ref_column = foreign_key_match.groups()
-                            foreign_keys.append({
-                                "column": fk_column,
-                                "ref_table": ref_table,
-                                "ref_column": ref_column
-                            })
-                    elif line.startswith("PRIMARY KEY"):
-                        pk_match = primary_key_regex.search(line)
-                        if pk_match:
-                            primary_keys = pk_match.group(1).split(", ")
-                    else:
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            column_name, column_type = parts[0], parts[1]
-                            columns[column_name] = column_type
-
-                schema[table_name] = {
-                    "columns": columns,
-                    "primary_keys": primary_keys,
-                    "foreign_keys": foreign_keys
-                }
-
-            print("\nSQL schema parsed successfully.")
+            schema = copy.deepcopy(DataLoading._parse_sql_schema_cached(sql_script))
+            logger.info("\nSQL schema parsed successfully.")
             return schema
 
         except Exception as e:
-            print(f"\nError parsing SQL schema: {e}")
+            logger.error("\nError parsing SQL schema: %s", e)
             raise
 
     @staticmethod
-    def insert_dataframes_to_db(dataframe_dict, conn):
+    @lru_cache(maxsize=8)
+    def _parse_sql_schema_cached(sql_script):
+        schema = {}
+        create_table_regex = re.compile(r"CREATE TABLE IF NOT EXISTS (\w+)\s*\((.*?)\);", re.S)
+        foreign_key_regex = re.compile(r"FOREIGN KEY\s*\((\w+)\)\s*REFERENCES\s*(\w+)\((\w+)\)")
+        primary_key_regex = re.compile(r"PRIMARY KEY\s*\((.*?)\)")
+
+        tables = create_table_regex.findall(sql_script)
+
+        for table_name, table_definition in tables:
+            columns = {}
+            primary_keys = []
+            foreign_keys = []
+
+            for line in table_definition.splitlines():
+                line = line.strip().strip(",")
+                if line.startswith("FOREIGN KEY"):
+                    foreign_key_match = foreign_key_regex.search(line)
+                    if foreign_key_match:
+                        fk_column, ref_table, ref_column = foreign_key_match.groups()
+                        foreign_keys.append({
+                            "column": fk_column,
+                            "ref_table": ref_table,
+                            "ref_column": ref_column
+                        })
+                elif line.startswith("PRIMARY KEY"):
+                    pk_match = primary_key_regex.search(line)
+                    if pk_match:
+                        primary_keys = pk_match.group(1).split(", ")
+                else:
+                    parts = line.split()
+                    if len(parts) >= 2:
+                        column_name, column_type = parts[0], parts[1]
+                        columns[column_name] = column_type
+
+            schema[table_name] = {
+                "columns": columns,
+                "primary_keys": primary_keys,
+                "foreign_keys": foreign_keys
+            }
+
+        return schema
+
+    @staticmethod
+    def build_casting_plan(schema):
+        """
+        Builds the typed casting plan from a parsed schema: {table_name: {column_name: pandas dtype}}.
         """
-        Insert DataFrames into the SQLite database.
+        plan = {}
+        for table_name, table_schema in schema.items():
+            plan[table_name] = {}
+            for column_name, sql_type in table_schema["columns"].items():
+                dtype = DataLoading.SQL_TYPE_TO_DTYPE.get(sql_type.upper())
+                if dtype is None:
+                    raise ValueError(f"\nNo dtype mapping for SQL type '{sql_type}' of column "
+                                     f"'{table_name}.{column_name}'.")
+                plan[table_name][column_name] = dtype
+        return plan
+
+    @staticmethod
+    def insert_dataframes_to_db(dataframe_dict, conn, load_order=None):
+        """
+        Insert DataFrames into the SQLite database tables created from the schema (see recreate_tables).
+        Tables are filled in `load_order`, parents first, so foreign keys can stay enforced.
         """
         try:
-            for table_name, df in dataframe_dict.items():
-                table_name = table_name.replace('_df', '')
-                df.to_sql(table_name, conn, if_exists='replace', index=False)
-                print(f"\nData inserted into table '{table_name}' successfully with {len(df)} rows.")
+            table_names = load_order or [df_table_name.replace('_df', '') for df_table_name in dataframe_dict]
+            for table_name in table_names:
+                df = dataframe_dict[f"{table_name}_df"]
+                df.to_sql(table_name, conn, if_exists='append', index=False)
+                logger.info("\nData inserted into table '%s' successfully with %s rows.", table_name, len(df),
+                            extra={'table': table_name, 'rows': len(df)})
         except sqlite3.Error as db_error:
-            print(f"\nError inserting data into database: {db_error}")
+            logger.error("\nError inserting data into database: %s", db_error)
             raise
         except Exception as e:
-            print(f"\nUnexpected error inserting data into tables: {e}")
+            logger.error("\nUnexpected error inserting data into tables: %s", e)
             raise
 
+    @staticmethod
+    def recreate_tables(conn, sql_script, load_order):
+        """
+        Drops the loaded tables (children first) and the derived aggregate table, then recreates the tables from
+        the SQL schema. Both load modes start from this layout, with the schema's primary and foreign keys.
+        The aggregates reference the old rows and are rebuilt by save_depth_aggregates after the load.
+        """
+        conn.execute('PRAGMA foreign_keys = OFF;')
+        conn.execute(f"DROP TABLE IF EXISTS {DataLoading.AGGREGATE_TABLE}")
+        for table_name in reversed(load_order):
+            conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+        conn.executescript(sql_script)
+        conn.execute('PRAGMA foreign_keys = ON;')
+
     @staticmethod
     def check_column_type(series, expected_type):
         """
@@ -118,59 +178,107 @@ class DataLoading:
             elif expected_type == "FLOAT" or expected_type == "REAL":
                 return pd.api.types.is_float_dtype(series)
             elif expected_type == "TEXT":
-                return pd.api.types.is_object_dtype(series)
+                return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
             elif expected_type == "DATETIME":
                 return pd.api.types.is_datetime64_any_dtype(series)
             return False
         except Exception as e:
-            print(f"\nError checking column type: {e}")
+            logger.error("\nError checking column type: %s", e)
             raise
 
     @staticmethod
-    def correct_column_types(df: pd.DataFrame, schema: dict, df_table_name: str) -> pd.DataFrame:
+    def coerce_with_casting_plan(df: pd.DataFrame, dtype_map: dict):
+        """
+        Cast the columns in `dtype_map` in one batch per target kind, without copying the untouched columns.
+
+        Parameters:
+        df (pd.DataFrame): DataFrame to cast. It is not modified.
+        dtype_map (dict): {column_name: pandas dtype} for the columns that need a cast.
+
+        Returns:
+        tuple: (corrected DataFrame, report DataFrame with one row per cast column and the number of
+                non-null values that became null during coercion).
+        """
+        # Shallow copy: new column objects are swapped in, unchanged columns keep sharing their data
+        corrected_df = df.copy(deep=False)
+        report = []
+
+        numeric_columns = [column for column, dtype in dtype_map.items() if dtype in ('Int64', 'float64')]
+        datetime_columns = [column for column, dtype in dtype_map.items() if dtype.startswith('datetime64')]
+        text_columns = [column for column, dtype in dtype_map.items() if dtype == 'str']
+
+        coerced = {}
+        if numeric_columns:
+            numeric_df = df[numeric_columns].apply(pd.to_numeric, errors='coerce')
+            numeric_dtypes = {}
+            for column in numeric_columns:
+                dtype = dtype_map[column]
+                # Keep fractional values as float instead of truncating them into an integer column
+                if dtype == 'Int64' and not (numeric_df[column].dropna() % 1 == 0).all():
+                    dtype = 'float64'
+                numeric_dtypes[column] = dtype
+            coerced.update(numeric_df.astype(numeric_dtypes).items())
+        for column in datetime_columns:
+            coerced[column] = pd.to_datetime(df[column], format='%Y-%m-%d', errors='coerce')
+        for column in text_columns:
+            coerced[column] = df[column].astype('str')
+
+        for column, series in coerced.items():
+            report.append({
+                'column_name': column,
+                'from_type': str(df[column].dtype).upper(),
+                'to_type': str(series.dtype).upper(),
+                'coerced_to_null': int((series.isna() & df[column].notna()).sum())
+            })
+            corrected_df[column] = series
+
+        return corrected_df, pd.DataFrame(report, columns=['column_name', 'from_type', 'to_type', 'coerced_to_null'])
+
+    @staticmethod
+    def correct_column_types(df: pd.DataFrame, schema: dict, df_table_name: str, dtype_map: dict = None) -> pd.DataFrame:
         """
         Correct the data types of the DataFrame columns to match the SQL schema.
+        `dtype_map` is the table's entry of the casting plan (see build_casting_plan), built from `schema` if None.
         """
         try:
-            corrected_df = df.copy()
-            print(f"\nDatatype validation and correction in '{df_table_name}' based on Schema before data insertion.\n")
+            logger.info("\nDatatype validation and correction in '%s' based on Schema before data insertion.\n",
+                        df_table_name)
+            if dtype_map is None:
+                dtype_map = DataLoading.build_casting_plan({df_table_name: schema})[df_table_name]
+
+            columns_to_cast = {}
             for column_name, expected_type in schema["columns"].items():
-                if column_name in corrected_df.columns:
-                    actual_type = str(corrected_df[column_name].dtype).upper()
-
-                    if not DataLoading.check_column_type(corrected_df[column_name], expected_type):
-                        print(f"\nCorrecting column '{column_name}' from type '{actual_type}' to '{expected_type}'")
-
-                        if expected_type == "INTEGER":
-                            corrected_df[column_name] = pd.to_numeric(corrected_df[column_name], errors='coerce',
-                                                                      downcast='integer')
-                        elif expected_type == "FLOAT" or expected_type == "REAL":
-                            corrected_df[column_name] = pd.to_numeric(corrected_df[column_name], errors='coerce',
-                                                                      downcast='float')
-                        elif expected_type == "TEXT":
-                            corrected_df[column_name] = corrected_df[column_name].astype('str')
-                        elif expected_type == "DATETIME":
-                            corrected_df[column_name] = pd.to_datetime(corrected_df[column_name], format='%Y-%m-%d',
-                                                                       errors='coerce')
-
-                        new_type = str(corrected_df[column_name].dtype).upper()
-                        print(f"Column '{column_name}' has been corrected to type '{new_type}'")
+                if column_name in df.columns:
+                    if not DataLoading.check_column_type(df[column_name], expected_type):
+                        columns_to_cast[column_name] = dtype_map[column_name]
                     else:
-                        print(f"Column '{column_name}' already matches the expected type '{expected_type}'.")
+                        logger.debug("Column '%s' already matches the expected type '%s'.", column_name, expected_type)
+
+            corrected_df, coercion_report = DataLoading.coerce_with_casting_plan(df, columns_to_cast)
 
-            print("\nColumn types corrected successfully.")
+            if not coercion_report.empty:
+                logger.info("\nCorrected column types in '%s':\n%s", df_table_name, coercion_report)
+                lossy = coercion_report[coercion_report['coerced_to_null'] > 0]
+                for _, row in lossy.iterrows():
+                    logger.warning("Warning: %s value(s) in '%s' could not be converted to %s and were set to null.",
+                                   row['coerced_to_null'], row['column_name'], row['to_type'])
+
+            logger.info("\nColumn types corrected successfully.")
             return corrected_df
 
         except Exception as e:
-            print(f"\nError correcting column types: {e}")
+            logger.error("\nError correcting column types: %s", e)
             raise
 
     @staticmethod
-    def validate_and_correct_dataframe(schema, df_dict):
+    def validate_and_correct_dataframe(schema, df_dict, casting_plan=None):
         """
         Validate and correct the DataFrames against the SQL schema.
         """
         try:
+            if casting_plan is None:
+                casting_plan = DataLoading.build_casting_plan(schema)
+
             for table_name, table_schema in schema.items():
                 df_table_name = f"{table_name}_df"
 
@@ -191,7 +299,8 @@ class DataLoading:
                     raise ValueError(
                         f"\nDataFrame for table '{table_name}' is missing columns from SQL schema: {missing_columns}")
 
-                df_corrected = DataLoading.correct_column_types(df, table_schema, df_table_name)
+                df_corrected = DataLoading.correct_column_types(df, table_schema, df_table_name,
+                                                                casting_plan[table_name])
                 df_dict[df_table_name] = df_corrected
 
                 for pk in table_schema["primary_keys"]:
@@ -203,52 +312,378 @@ class DataLoading:
                         raise ValueError(
                             f"\nForeign key column '{fk['column']}' is missing in DataFrame for table '{table_name}'.")
 
-            print("\nDataFrames validated and corrected successfully.")
+            logger.info("\nDataFrames validated and corrected successfully.")
         except Exception as e:
-            print(f"\nError validating or correcting DataFrames: {e}")
+            logger.error("\nError validating or correcting DataFrames: %s", e)
             raise
 
+    @staticmethod
+    def get_db_file_path(file_name='seqana_soil_data.db'):
+        """
+        Returns the path of the SQLite database file inside the project 'src' directory.
+        """
+        return os.path.join(os.getcwd(), 'src', file_name)
+
+    @staticmethod
+    def bump_data_version(conn):
+        """
+        Increments the data version counter stored in the database. Readers (e.g. QueryResultCache) compare
+        this counter to detect that a new load was committed. Runs inside the caller's transaction.
+        """
+        try:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {DataLoading.DATA_VERSION_TABLE} ("
+                         "id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL, updated_at TEXT)")
+            conn.execute(f"INSERT INTO {DataLoading.DATA_VERSION_TABLE} (id, version, updated_at) "
+                         "VALUES (1, 1, datetime('now')) "
+                         "ON CONFLICT(id) DO UPDATE SET version = version + 1, updated_at = datetime('now')")
+            version = DataLoading.get_data_version(conn)
+            logger.info("\nData version bumped to %s.", version)
+            return version
+        except sqlite3.Error as db_error:
+            logger.error("\nError updating data version: %s", db_error)
+            raise
+
+    @staticmethod
+    def get_data_version(conn):
+        """
+        Returns the current data version counter, or 0 if no load has been committed yet.
+        """
+        try:
+            row = conn.execute(f"SELECT version FROM {DataLoading.DATA_VERSION_TABLE} WHERE id = 1").fetchone()
+        except sqlite3.OperationalError:
+            return 0
+        return row[0] if row else 0
+
     @staticmethod
     def save_to_sqlite(dataframe_dict, sql_script_name, file_name='seqana_soil_data.db'):
         """
         Saves the normalized data (from DataFrames) into SQLite database.
+        Returns True when the data was committed, False when the load was rolled back.
         """
         conn = None  # Initialize conn to None to avoid 'referenced before assignment' issues
         try:
-            directory = os.getcwd()
-            dataset_directory = os.path.join(directory, 'src')
-            db_file_name = os.path.join(dataset_directory, file_name)
+            db_file_name = DataLoading.get_db_file_path(file_name)
 
             conn = sqlite3.connect(db_file_name)
-            print(f"\nConnected to SQLite database at {db_file_name}")
+            logger.info("\nConnected to SQLite database at %s", db_file_name)
 
             # Ensure sqlite consider foreign keys checks for the session
             conn.execute('PRAGMA foreign_keys = ON;')
 
-            print("\nInitializing database schema...")
+            logger.info("\nInitializing database schema...")
             sql_script = DataLoading.initialize_database(sql_script_name, conn)
 
-            print("\nParsing SQL schema...")
+            logger.info("\nParsing SQL schema...")
+            schema = DataLoading.parse_sql_schema(sql_script)
+            casting_plan = DataLoading.build_casting_plan(schema)
+
+            logger.info("\nValidating and Correcting DataFrames against SQL schema...")
+            DataLoading.validate_and_correct_dataframe(schema, dataframe_dict, casting_plan)
+
+            logger.info("\nRecreating the database tables from the SQL schema...")
+            load_order = DataLoading.get_table_load_order(schema)
+            DataLoading.recreate_tables(conn, sql_script, load_order)
+
+            logger.info("\nInserting data into database tables...")
+            DataLoading.insert_dataframes_to_db(dataframe_dict, conn, load_order)
+
+            # The plain load replaces whatever an interrupted chunked load left behind
+            DataLoading.clear_load_state(conn)
+
+            # Invalidate cached reads of the previous load
+            DataLoading.bump_data_version(conn)
+
+            conn.commit()
+            logger.info("\nData committed successfully.")
+            return True
+
+        except sqlite3.Error as db_error:
+            logger.error("\nSQLite Error: %s", db_error)
+            if conn:
+                conn.rollback()
+        except Exception as e:
+            logger.error("\nUnexpected error: %s", e)
+            if conn:
+                conn.rollback()
+        finally:
+            if conn:
+                conn.close()
+                logger.info("\nSQLite connection closed.")
+        return False
+
+    @staticmethod
+    def get_table_load_order(schema):
+        """
+        Orders the schema tables so that every table comes after the tables its foreign keys reference.
+        """
+        ordered = []
+        remaining = list(schema)
+        while remaining:
+            ready = [table_name for table_name in remaining
+                     if all(fk["ref_table"] in ordered or fk["ref_table"] == table_name
+                            for fk in schema[table_name]["foreign_keys"])]
+            if not ready:
+                raise ValueError(f"\nCircular foreign keys between tables: {remaining}")
+            ordered.extend(ready)
+            remaining = [table_name for table_name in remaining if table_name not in ready]
+        return ordered
+
+    @staticmethod
+    def compute_load_token(dataframe_dict):
+        """
+        Fingerprint of the data being loaded. A resumed load is only allowed for the same token.
+        """
+        digest = hashlib.sha256()
+        for df_table_name in sorted(dataframe_dict):
+            df = dataframe_dict[df_table_name].sort_values('id')
+            digest.update(df_table_name.encode())
+            digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _rows_for_insert(df):
+        """ Converts a DataFrame chunk into tuples of Python values sqlite3 can bind (None for missing). """
+        df = df.copy()
+        for column in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[column]):
+                df[column] = df[column].dt.strftime('%Y-%m-%d %H:%M:%S')
+        df = df.astype(object)
+        return list(df.where(df.notna(), None).itertuples(index=False, name=None))
+
+    @staticmethod
+    def get_load_state(conn):
+        """
+        Returns the chunked load progress as {table_name: {...}}, empty when no load state exists.
+        """
+        try:
+            rows = conn.execute(f"SELECT table_name, load_token, last_key, rows_loaded, expected_rows, status "
+                                f"FROM {DataLoading.LOAD_STATE_TABLE}").fetchall()
+        except sqlite3.OperationalError:
+            return {}
+        return {row[0]: {'load_token': row[1], 'last_key': row[2], 'rows_loaded': row[3],
+                         'expected_rows': row[4], 'status': row[5]} for row in rows}
+
+    @staticmethod
+    def clear_load_state(conn):
+        """ Drop the chunked load progress, so no table is reported as 'in_progress' anymore. """
+        conn.execute(f"DROP TABLE IF EXISTS {DataLoading.LOAD_STATE_TABLE}")
+
+    @staticmethod
+    def verify_load_consistency(conn, dataframe_dict):
+        """
+        Final consistency check of a load: foreign key integrity and row count of every loaded table.
+        Only the loaded tables are checked, derived tables such as the aggregates are refreshed after the load.
+        Raises ValueError on the first problem found.
+        """
+        for df_table_name in dataframe_dict:
+            table_name = df_table_name.replace('_df', '')
+            fk_violations = conn.execute(f"PRAGMA foreign_key_check({table_name})").fetchall()
+            if fk_violations:
+                raise ValueError(f"\n{len(fk_violations)} foreign key violation(s) found in '{table_name}', "
+                                 f"e.g. {fk_violations[:5]}")
+
+        for df_table_name, df in dataframe_dict.items():
+            table_name = df_table_name.replace('_df', '')
+            row_count = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+            if row_count != len(df):
+                raise ValueError(f"\nTable '{table_name}' has {row_count} rows, expected {len(df)}.")
+        logger.info("\nLoad consistency check passed (foreign keys and row counts).")
+
+    @staticmethod
+    def save_to_sqlite_chunked(dataframe_dict, sql_script_name, file_name='seqana_soil_data.db', chunk_size=50000):
+        """
+        Saves the normalized data into SQLite in chunks of `chunk_size` rows, committing after every chunk.
+
+        Progress (table, last loaded id, rows loaded) is kept in the load state table. When a previous chunked
+        load of the same data did not complete, the load resumes after the last committed chunk instead of
+        starting over. The load is only marked complete after the foreign key and row count check.
+        Returns True when the load completed, False otherwise.
+        """
+        conn = None
+        try:
+            db_file_name = DataLoading.get_db_file_path(file_name)
+            conn = sqlite3.connect(db_file_name)
+            logger.info("\nConnected to SQLite database at %s", db_file_name)
+
+            logger.info("\nInitializing database schema...")
+            sql_script = DataLoading.initialize_database(sql_script_name, conn)
             schema = DataLoading.parse_sql_schema(sql_script)
+            casting_plan = DataLoading.build_casting_plan(schema)
+
+            logger.info("\nValidating and Correcting DataFrames against SQL schema...")
+            DataLoading.validate_and_correct_dataframe(schema, dataframe_dict, casting_plan)
+
+            load_order = DataLoading.get_table_load_order(schema)
+            load_token = DataLoading.compute_load_token(dataframe_dict)
+            load_state = DataLoading.get_load_state(conn)
+
+            resumable = (set(load_state) == set(load_order)
+                         and all(state['load_token'] == load_token and state['status'] == 'in_progress'
+                                 for state in load_state.values()))
+
+            if resumable:
+                logger.info("\nResuming the interrupted load from the last committed chunk...")
+            else:
+                logger.info("\nStarting a new chunked load...")
+                DataLoading.recreate_tables(conn, sql_script, load_order)
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {DataLoading.LOAD_STATE_TABLE} ("
+                             "table_name TEXT PRIMARY KEY, load_token TEXT, last_key INTEGER, "
+                             "rows_loaded INTEGER, expected_rows INTEGER, status TEXT, updated_at TEXT)")
+                conn.execute(f"DELETE FROM {DataLoading.LOAD_STATE_TABLE}")
+                conn.executemany(f"INSERT INTO {DataLoading.LOAD_STATE_TABLE} (table_name, load_token, last_key, "
+                                 "rows_loaded, expected_rows, status, updated_at) "
+                                 "VALUES (?, ?, NULL, 0, ?, 'in_progress', datetime('now'))",
+                                 [(table_name, load_token, len(dataframe_dict[f"{table_name}_df"]))
+                                  for table_name in load_order])
+                conn.commit()
+                load_state = DataLoading.get_load_state(conn)
 
-            print("\nValidating and Correcting DataFrames against SQL schema...")
-            DataLoading.validate_and_correct_dataframe(schema, dataframe_dict)
+            conn.execute('PRAGMA foreign_keys = ON;')
 
-            print("\nInserting data into database tables...")
-            DataLoading.insert_dataframes_to_db(dataframe_dict, conn)
+            for table_name in load_order:
+                df = dataframe_dict[f"{table_name}_df"].sort_values('id', kind='mergesort')
+                last_key = load_state[table_name]['last_key']
+                if last_key is not None:
+                    df = df[df['id'] > last_key]
+
+                columns = ', '.join(df.columns)
+                placeholders = ', '.join('?' * len(df.columns))
+                insert_sql = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+
+                for start in range(0, len(df), chunk_size):
+                    chunk = df.iloc[start:start + chunk_size]
+                    conn.executemany(insert_sql, DataLoading._rows_for_insert(chunk))
+                    conn.execute(f"UPDATE {DataLoading.LOAD_STATE_TABLE} SET last_key = ?, "
+                                 "rows_loaded = rows_loaded + ?, updated_at = datetime('now') WHERE table_name = ?",
+                                 (int(chunk['id'].iloc[-1]), len(chunk), table_name))
+                    conn.commit()
+
+                logger.info("\nData inserted into table '%s' successfully, %s rows in %s chunk(s).",
+                            table_name, len(df), -(-len(df) // chunk_size),
+                            extra={'table': table_name, 'rows': len(df)})
+
+            DataLoading.verify_load_consistency(conn, dataframe_dict)
+
+            conn.execute(f"UPDATE {DataLoading.LOAD_STATE_TABLE} SET status = 'complete', "
+                         "updated_at = datetime('now')")
+            DataLoading.bump_data_version(conn)
+            conn.commit()
+            logger.info("\nChunked load completed and committed successfully.")
+            return True
+
+        except sqlite3.Error as db_error:
+            logger.error("\nSQLite Error: %s", db_error)
+            if conn:
+                conn.rollback()
+        except Exception as e:
+            logger.error("\nUnexpected error: %s", e)
+            if conn:
+                conn.rollback()
+        finally:
+            if conn:
+                conn.close()
+                logger.info("\nSQLite connection closed.")
+        return False
+
+    @staticmethod
+    def initialize_aggregate_table(conn):
+        """
+        Creates the depth-harmonized aggregate table and its lookup index if they do not exist.
+        """
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {DataLoading.AGGREGATE_TABLE} (
+                orgc_profile_id INTEGER,
+                orgc_method_id INTEGER,
+                upper_depth INTEGER,
+                lower_depth INTEGER,
+                orgc_value_weighted REAL,
+                orgc_value_min REAL,
+                orgc_value_max REAL,
+                layer_count INTEGER,
+                covered_thickness REAL,
+                coverage_ratio REAL,
+                FOREIGN KEY(orgc_profile_id) REFERENCES orgc_profile(id),
+                FOREIGN KEY(orgc_method_id) REFERENCES orgc_method(id)
+            )""")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{DataLoading.AGGREGATE_TABLE}_lookup "
+                     f"ON {DataLoading.AGGREGATE_TABLE} (orgc_profile_id, upper_depth, lower_depth)")
+
+    @staticmethod
+    def refresh_depth_aggregates(conn, orgc_profile_ids=None, intervals=DataDepthAggregate.STANDARD_DEPTH_INTERVALS):
+        """
+        Recomputes the depth-weighted aggregates from 'orgc_profile_layer' and writes them into the aggregate table.
+
+        Parameters:
+        conn (sqlite3.Connection): Open connection. The caller commits.
+        orgc_profile_ids (list, optional): Only refresh these orgc_profile.id values. All profiles if None.
+        intervals (sequence of (upper, lower)): Depth intervals in cm.
+
+        Returns:
+        int: Number of aggregate rows written.
+        """
+        try:
+            DataLoading.initialize_aggregate_table(conn)
+            layer_query = ("SELECT orgc_profile_id, orgc_method_id, upper_depth, lower_depth, orgc_value "
+                           "FROM orgc_profile_layer")
+            # Keep the ids integer when a foreign key is NULL, read_sql_query would return float64
+            id_dtypes = {'orgc_profile_id': 'Int64', 'orgc_method_id': 'Int64'}
+
+            if orgc_profile_ids is None:
+                conn.execute(f"DELETE FROM {DataLoading.AGGREGATE_TABLE}")
+                layer_df = pd.read_sql_query(layer_query, conn, dtype=id_dtypes)
+            else:
+                orgc_profile_ids = [int(profile_id) for profile_id in orgc_profile_ids]
+                layer_frames = []
+                # Stay below SQLite's bound parameter limit
+                for start in range(0, len(orgc_profile_ids), 900):
+                    batch = orgc_profile_ids[start:start + 900]
+                    placeholders = ', '.join('?' * len(batch))
+                    conn.execute(f"DELETE FROM {DataLoading.AGGREGATE_TABLE} "
+                                 f"WHERE orgc_profile_id IN ({placeholders})", batch)
+                    layer_frames.append(pd.read_sql_query(
+                        f"{layer_query} WHERE orgc_profile_id IN ({placeholders})", conn, params=batch,
+                        dtype=id_dtypes))
+                layer_df = pd.concat(layer_frames, ignore_index=True) if layer_frames else pd.DataFrame(
+                    columns=['orgc_profile_id', 'orgc_method_id', 'upper_depth', 'lower_depth', 'orgc_value'])
+
+            aggregate_df = DataDepthAggregate.compute_depth_weighted_aggregates(layer_df, intervals)
+            aggregate_df.to_sql(DataLoading.AGGREGATE_TABLE, conn, if_exists='append', index=False)
+            logger.info("\nRefreshed '%s' with %s rows.", DataLoading.AGGREGATE_TABLE, len(aggregate_df))
+            return len(aggregate_df)
+
+        except sqlite3.Error as db_error:
+            logger.error("\nError refreshing depth aggregates: %s", db_error)
+            raise
+
+    @staticmethod
+    def save_depth_aggregates(file_name='seqana_soil_data.db', orgc_profile_ids=None,
+                              intervals=DataDepthAggregate.STANDARD_DEPTH_INTERVALS):
+        """
+        Post-load stage: materializes depth-weighted orgc_value aggregates into the SQLite database.
+        Pass `orgc_profile_ids` to refresh only the profiles that changed.
+        Returns True when the aggregates were committed, False when the refresh was rolled back.
+        """
+        conn = None
+        try:
+            conn = sqlite3.connect(DataLoading.get_db_file_path(file_name))
+            logger.info("\nMaterializing depth-harmonized aggregates...")
+            DataLoading.refresh_depth_aggregates(conn, orgc_profile_ids, intervals)
 
+            # Aggregates changed, invalidate cached reads
+            DataLoading.bump_data_version(conn)
             conn.commit()
-            print("\nData committed successfully.")
+            logger.info("\nDepth aggregates committed successfully.")
+            return True
 
         except sqlite3.Error as db_error:
-            print(f"\nSQLite Error: {db_error}")
+            logger.error("\nSQLite Error: %s", db_error)
             if conn:
                 conn.rollback()
         except Exception as e:
-            print(f"\nUnexpected error: {e}")
+            logger.error("\nUnexpected error: %s", e)
             if conn:
                 conn.rollback()
         finally:
             if conn:
                 conn.close()
-                print(f"\nSQLite connection closed.")
+        return False
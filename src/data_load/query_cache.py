@@ -0,0 +1,161 @@
+# src/data_load/query_cache.py
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from src.data_load.data_loading import DataLoading
+
+logger = logging.getLogger(__name__)
+
+
+class QueryResultCache:
+    """
+    Bounded LRU cache for read queries against the loaded SQLite database.
+
+    Entries are keyed by (query, parameters) and expire after `ttl_seconds`. Every entry remembers the
+    data version (see DataLoading.bump_data_version) it was read under, so a new committed load
+    invalidates the whole cache without any explicit call.
+
+    The cache can be shared between threads: lookups, inserts, evictions and the counters are guarded by a lock,
+    which is also held while a missed query runs on the shared connection.
+    """
+
+    PROFILE_LAYERS_QUERY = """
+        SELECT p.profile_id, p.orgc_profile_code, p.orgc_dataset_id, p.latitude, p.longitude, p.country_name,
+               l.profile_layer_id, l.upper_depth, l.lower_depth, l.layer_name, l.litter,
+               l.orgc_method_id, l.orgc_value, l.orgc_value_avg, l.orgc_date
+        FROM orgc_profile p
+        JOIN orgc_profile_layer l ON l.orgc_profile_id = p.id
+        WHERE p.profile_id = ?
+        ORDER BY l.upper_depth, l.lower_depth, l.orgc_method_id
+    """
+
+    def __init__(self, conn, max_entries=4096, ttl_seconds=300.0, version_check_interval=1.0):
+        """
+        Parameters:
+        conn (sqlite3.Connection): Connection used to run queries and read the data version.
+        max_entries (int): Maximum number of cached results before the least recently used is evicted.
+        ttl_seconds (float): Lifetime of a cached result in seconds.
+        version_check_interval (float): Minimum seconds between two data version reads. 0 checks on every call.
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than 0.")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be greater than 0.")
+
+        self.conn = conn
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_check_interval = version_check_interval
+
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._data_version = None
+        self._version_checked_at = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _current_data_version(self):
+        """ Read the data version, at most once per `version_check_interval`, and drop stale entries. """
+        now = time.monotonic()
+        if (self._version_checked_at is not None
+                and now - self._version_checked_at < self.version_check_interval):
+            return self._data_version
+
+        version = DataLoading.get_data_version(self.conn)
+        self._version_checked_at = now
+
+        if version != self._data_version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._data_version = version
+
+        return version
+
+    def query(self, sql, params=()):
+        """
+        Run a read query through the cache.
+
+        Parameters:
+        sql (str): The SQL query text.
+        params (tuple): Query parameters. Must be hashable.
+
+        Returns:
+        tuple: (column_names, rows) where rows is a tuple of row tuples.
+        """
+        key = (sql, tuple(params))
+        with self._lock:
+            version = self._current_data_version()
+            now = time.monotonic()
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, entry_version, result = entry
+                if now < expires_at and entry_version == version:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._entries[key]
+                self.expirations += 1
+
+            self.misses += 1
+            cursor = self.conn.execute(sql, key[1])
+            columns = tuple(description[0] for description in cursor.description)
+            result = (columns, tuple(cursor.fetchall()))
+
+            self._entries[key] = (now + self.ttl_seconds, version, result)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+            return result
+
+    def get_profile_layers(self, profile_id):
+        """ Return the profile attributes joined with all its layers for a single `profile_id`. """
+        return self.query(self.PROFILE_LAYERS_QUERY, (int(profile_id),))
+
+    def get_profiles_layers(self, profile_ids):
+        """ Return a dictionary {profile_id: (column_names, rows)} for many profiles. """
+        return {profile_id: self.get_profile_layers(profile_id) for profile_id in profile_ids}
+
+    def invalidate(self):
+        """ Drop every cached result. """
+        with self._lock:
+            self._entries.clear()
+            self._version_checked_at = None
+            self.invalidations += 1
+
+    def get_stats(self):
+        """ Return cache metrics (size, hits, misses, hit rate, evictions, expirations, invalidations). """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'data_version': self._data_version,
+            }
+
+    @staticmethod
+    def connect(file_name='seqana_soil_data.db', **cache_options):
+        """
+        Open a read connection to the pipeline database and wrap it in a QueryResultCache.
+        """
+        try:
+            conn = sqlite3.connect(DataLoading.get_db_file_path(file_name), check_same_thread=False)
+            return QueryResultCache(conn, **cache_options)
+        except sqlite3.Error as db_error:
+            logger.error("\nError opening SQLite database for cached reads: %s", db_error)
+            raise
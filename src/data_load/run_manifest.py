@@ -0,0 +1,179 @@
+# src/data_load/run_manifest.py
+import glob
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+
+class RunManifest:
+    """
+    Content-addressed record of a pipeline run stored in the target database.
+
+    A manifest holds the source file hash, the pipeline version (hash of the pipeline code and SQL schema),
+    the run configuration hash and the row count and checksum of every loaded table. Comparing a new run's
+    hashes with the latest complete manifest tells whether the load can be skipped.
+    """
+
+    TABLE_NAME = 'etl_run_manifest'
+    DEFAULT_TABLES = ('orgc_method', 'orgc_profile', 'orgc_profile_layer', 'orgc_profile_soc_aggregate')
+    # Checksum row order of tables without an 'id' primary key
+    TABLE_ORDER = {'orgc_profile_soc_aggregate': 'orgc_profile_id, orgc_method_id, upper_depth, lower_depth'}
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    @staticmethod
+    def compute_file_hash(file_path):
+        """ SHA-256 of a file, read in chunks. """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(RunManifest.HASH_CHUNK_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def compute_pipeline_version(sql_script_path=None):
+        """
+        SHA-256 over the pipeline source files (src/**/*.py) and the SQL schema, so any code change forces a reload.
+        """
+        src_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        paths = sorted(glob.glob(os.path.join(src_directory, '**', '*.py'), recursive=True))
+        if sql_script_path:
+            paths.append(sql_script_path)
+
+        digest = hashlib.sha256()
+        for path in paths:
+            digest.update(os.path.relpath(path, src_directory).replace(os.sep, '/').encode())
+            with open(path, 'rb') as file:
+                digest.update(hashlib.sha256(file.read()).digest())
+        return digest.hexdigest()
+
+    @staticmethod
+    def compute_config_hash(config):
+        """ SHA-256 of the run configuration dictionary (key order independent). """
+        return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def compute_table_checksums(conn, table_names=DEFAULT_TABLES):
+        """
+        Row count and SHA-256 checksum of each table's content, read in 'id' order (or the table's TABLE_ORDER)
+        straight from the database.
+
+        Returns:
+        dict: {table_name: {'row_count': int, 'checksum': str}}. Missing tables get row_count None.
+        """
+        stats = {}
+        for table_name in table_names:
+            try:
+                order_by = RunManifest.TABLE_ORDER.get(table_name, 'id')
+                cursor = conn.execute(f"SELECT * FROM {table_name} ORDER BY {order_by}")
+            except sqlite3.OperationalError:
+                stats[table_name] = {'row_count': None, 'checksum': None}
+                continue
+
+            digest = hashlib.sha256()
+            row_count = 0
+            while True:
+                rows = cursor.fetchmany(10000)
+                if not rows:
+                    break
+                row_count += len(rows)
+                digest.update(repr(rows).encode())
+            stats[table_name] = {'row_count': row_count, 'checksum': digest.hexdigest()}
+        return stats
+
+    @staticmethod
+    def initialize_manifest_table(conn):
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {RunManifest.TABLE_NAME} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT,
+                source_file TEXT,
+                source_hash TEXT,
+                pipeline_version TEXT,
+                config_hash TEXT,
+                table_stats TEXT
+            )""")
+
+    @staticmethod
+    def record(conn, source_file, source_hash, pipeline_version, config_hash, table_names=DEFAULT_TABLES):
+        """
+        Compute the table checksums and store a new manifest. The caller commits.
+
+        Returns:
+        dict: The stored manifest.
+        """
+        RunManifest.initialize_manifest_table(conn)
+        manifest = {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'source_file': os.path.basename(source_file),
+            'source_hash': source_hash,
+            'pipeline_version': pipeline_version,
+            'config_hash': config_hash,
+            'table_stats': RunManifest.compute_table_checksums(conn, table_names)
+        }
+        conn.execute(f"INSERT INTO {RunManifest.TABLE_NAME} (created_at, source_file, source_hash, pipeline_version, "
+                     "config_hash, table_stats) VALUES (?, ?, ?, ?, ?, ?)",
+                     (manifest['created_at'], manifest['source_file'], source_hash, pipeline_version, config_hash,
+                      json.dumps(manifest['table_stats'], sort_keys=True)))
+        logger.info("\nRun manifest recorded: source %s, pipeline %s, config %s.",
+                    source_hash[:12], pipeline_version[:12], config_hash[:12])
+        return manifest
+
+    @staticmethod
+    def get_latest(conn):
+        """ The most recent manifest as a dictionary, or None. """
+        try:
+            row = conn.execute(f"SELECT created_at, source_file, source_hash, pipeline_version, config_hash, "
+                               f"table_stats FROM {RunManifest.TABLE_NAME} ORDER BY id DESC LIMIT 1").fetchone()
+        except sqlite3.OperationalError:
+            return None
+        if row is None:
+            return None
+        return {
+            'created_at': row[0],
+            'source_file': row[1],
+            'source_hash': row[2],
+            'pipeline_version': row[3],
+            'config_hash': row[4],
+            'table_stats': json.loads(row[5])
+        }
+
+    @staticmethod
+    def verify_tables(conn, manifest):
+        """
+        Recompute the table checksums and compare them with a manifest, without reloading anything.
+
+        Returns:
+        list of str: Tables whose row count or checksum differ. Empty when the database matches.
+        """
+        expected = manifest['table_stats']
+        actual = RunManifest.compute_table_checksums(conn, list(expected))
+        return [table_name for table_name, stats in expected.items() if actual[table_name] != stats]
+
+    @staticmethod
+    def check_up_to_date(conn, source_hash, pipeline_version, config_hash, verify_tables=False):
+        """
+        Fast pre-check: is the database already loaded from the same source, code and configuration?
+        With verify_tables the table checksums are recomputed as well, which scans every loaded table.
+
+        Returns:
+        tuple: (bool, reason str)
+        """
+        latest = RunManifest.get_latest(conn)
+        if latest is None:
+            return False, "no previous run manifest"
+        if latest['source_hash'] != source_hash:
+            return False, "source file changed"
+        if latest['pipeline_version'] != pipeline_version:
+            return False, "pipeline code or schema changed"
+        if latest['config_hash'] != config_hash:
+            return False, "run configuration changed"
+        if verify_tables:
+            mismatched = RunManifest.verify_tables(conn, latest)
+            if mismatched:
+                return False, f"table content differs from manifest: {mismatched}"
+        return True, f"unchanged since run at {latest['created_at']}"
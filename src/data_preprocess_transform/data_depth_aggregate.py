@@ -0,0 +1,103 @@
+# src/data_preprocess_transform/data_depth_aggregate.py
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class DataDepthAggregate:
+    # Standard depth intervals in cm as (upper_depth, lower_depth)
+    STANDARD_DEPTH_INTERVALS = ((0, 30), (30, 100))
+
+    AGGREGATE_COLUMNS = ['orgc_profile_id', 'orgc_method_id', 'upper_depth', 'lower_depth',
+                         'orgc_value_weighted', 'orgc_value_min', 'orgc_value_max',
+                         'layer_count', 'covered_thickness', 'coverage_ratio']
+
+    @staticmethod
+    def compute_overlap_weights(upper_depth, lower_depth, intervals=STANDARD_DEPTH_INTERVALS):
+        """
+        Compute the thickness (cm) of every layer falling inside every depth interval.
+
+        Parameters:
+        upper_depth (array-like): Layer upper depths, length n.
+        lower_depth (array-like): Layer lower depths, length n.
+        intervals (sequence of (upper, lower)): Depth intervals, length k.
+
+        Returns:
+        np.ndarray: (n, k) array of overlap thickness, 0 where a layer does not touch an interval.
+        """
+        upper_depth = np.asarray(upper_depth, dtype='float64')[:, None]
+        lower_depth = np.asarray(lower_depth, dtype='float64')[:, None]
+        bounds = np.asarray(intervals, dtype='float64')
+
+        overlap = np.minimum(lower_depth, bounds[None, :, 1]) - np.maximum(upper_depth, bounds[None, :, 0])
+        # NaN depths give NaN overlap, treat them as no overlap
+        return np.nan_to_num(np.clip(overlap, 0, None), nan=0.0)
+
+    @staticmethod
+    def compute_depth_weighted_aggregates(orgc_profile_layer_df, intervals=STANDARD_DEPTH_INTERVALS):
+        """
+        Compute depth-weighted orgc_value per profile, method and standard depth interval.
+
+        Each layer contributes to an interval with a weight equal to the thickness it shares with that interval.
+        Layers without a numeric orgc_value or with lower_depth <= upper_depth are ignored.
+
+        Parameters:
+        orgc_profile_layer_df (pd.DataFrame): Normalized layer table (orgc_profile_id, orgc_method_id,
+                                              upper_depth, lower_depth, orgc_value).
+        intervals (sequence of (upper, lower)): Depth intervals in cm.
+
+        Returns:
+        pd.DataFrame: One row per (orgc_profile_id, orgc_method_id, interval) with the weighted value,
+                      per-method min/max, layer count and interval coverage.
+        """
+        logger.info("\n**************")
+        logger.info("Computing depth-weighted orgc_value aggregates for intervals %s", list(intervals))
+        logger.info("**************\n")
+
+        bounds = np.asarray(intervals, dtype='float64')
+        values = pd.to_numeric(orgc_profile_layer_df['orgc_value'], errors='coerce').to_numpy(dtype='float64')
+        upper_depth = pd.to_numeric(orgc_profile_layer_df['upper_depth'], errors='coerce').to_numpy(dtype='float64')
+        lower_depth = pd.to_numeric(orgc_profile_layer_df['lower_depth'], errors='coerce').to_numpy(dtype='float64')
+
+        weights = DataDepthAggregate.compute_overlap_weights(upper_depth, lower_depth, bounds)
+        weights[np.isnan(values)] = 0.0
+
+        # Long form: one entry per (layer, interval) pair that actually overlaps
+        layer_idx, interval_idx = np.nonzero(weights > 0)
+        if layer_idx.size == 0:
+            logger.info("No layer overlaps the requested depth intervals.")
+            return pd.DataFrame(columns=DataDepthAggregate.AGGREGATE_COLUMNS)
+
+        pair_weights = weights[layer_idx, interval_idx]
+        pair_values = values[layer_idx]
+
+        long_df = pd.DataFrame({
+            'orgc_profile_id': orgc_profile_layer_df['orgc_profile_id'].to_numpy()[layer_idx],
+            'orgc_method_id': orgc_profile_layer_df['orgc_method_id'].to_numpy()[layer_idx],
+            'interval': interval_idx,
+            'weighted_value': pair_weights * pair_values,
+            'weight': pair_weights,
+            'value': pair_values,
+        })
+
+        aggregates = long_df.groupby(['orgc_profile_id', 'orgc_method_id', 'interval'], sort=True,
+                                     dropna=False).agg(weighted_sum=('weighted_value', 'sum'),
+                                                       covered_thickness=('weight', 'sum'),
+                                                       orgc_value_min=('value', 'min'),
+                                                       orgc_value_max=('value', 'max'),
+                                                       layer_count=('value', 'size')).reset_index()
+
+        interval_codes = aggregates['interval'].to_numpy()
+        aggregates['upper_depth'] = bounds[interval_codes, 0].astype('int64')
+        aggregates['lower_depth'] = bounds[interval_codes, 1].astype('int64')
+        aggregates['orgc_value_weighted'] = aggregates['weighted_sum'] / aggregates['covered_thickness']
+        aggregates['coverage_ratio'] = aggregates['covered_thickness'] / (bounds[interval_codes, 1] -
+                                                                          bounds[interval_codes, 0])
+
+        aggregates = aggregates[DataDepthAggregate.AGGREGATE_COLUMNS].reset_index(drop=True)
+        logger.info("Computed %s depth-weighted aggregate rows.\n", len(aggregates))
+        return aggregates
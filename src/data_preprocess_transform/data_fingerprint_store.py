@@ -0,0 +1,97 @@
+# src/data_preprocess_transform/data_fingerprint_store.py
+
+import sqlite3
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+
+class FingerprintStore:
+    """
+    Disk-backed set of 64-bit row fingerprints for duplicate detection across chunks and across runs.
+
+    Fingerprints are kept in a SQLite table, so the seen set does not have to fit in memory and survives restarts.
+    Duplicate counts are tracked per source (file, chunk stream, ...) for reporting.
+    """
+
+    TABLE_NAME = 'seen_fingerprints'
+
+    def __init__(self, db_path=':memory:'):
+        """
+        Parameters:
+        db_path (str): SQLite file holding the seen set. The default ':memory:' only lives for this process.
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} ("
+                          "fingerprint INTEGER PRIMARY KEY, source TEXT)")
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS chunk_fingerprints (fingerprint INTEGER PRIMARY KEY)")
+        self.conn.commit()
+
+        self.rows_seen = defaultdict(int)
+        self.duplicates_within_chunk = defaultdict(int)
+        self.duplicates_across_chunks = defaultdict(int)
+
+    def filter_new(self, fingerprints, source='default'):
+        """
+        Mark the rows whose fingerprint was never seen before and record them as seen.
+
+        Parameters:
+        fingerprints (array-like of uint64): Row fingerprints of one chunk.
+        source (str): Label used for the duplicate report.
+
+        Returns:
+        np.ndarray: Boolean mask, True for the first occurrence of a fingerprint not yet in the store.
+        """
+        fingerprints = np.asarray(fingerprints, dtype='uint64')
+        first_in_chunk = ~pd.Series(fingerprints).duplicated().to_numpy()
+
+        # SQLite integers are signed 64-bit, store the same bits as int64
+        chunk_keys = fingerprints[first_in_chunk].view('int64')
+
+        cursor = self.conn.cursor()
+        cursor.execute("DELETE FROM chunk_fingerprints")
+        cursor.executemany("INSERT INTO chunk_fingerprints (fingerprint) VALUES (?)",
+                           ((int(key),) for key in chunk_keys))
+        seen_keys = np.fromiter((row[0] for row in cursor.execute(
+            f"SELECT c.fingerprint FROM chunk_fingerprints c JOIN {self.TABLE_NAME} s USING (fingerprint)")),
+            dtype='int64')
+        cursor.execute(f"INSERT OR IGNORE INTO {self.TABLE_NAME} (fingerprint, source) "
+                       "SELECT fingerprint, ? FROM chunk_fingerprints", (source,))
+        self.conn.commit()
+
+        is_new = first_in_chunk.copy()
+        if seen_keys.size:
+            is_new &= ~np.isin(fingerprints.view('int64'), seen_keys)
+
+        self.rows_seen[source] += len(fingerprints)
+        self.duplicates_within_chunk[source] += int((~first_in_chunk).sum())
+        self.duplicates_across_chunks[source] += int((first_in_chunk & ~is_new).sum())
+        return is_new
+
+    def __len__(self):
+        return self.conn.execute(f"SELECT COUNT(*) FROM {self.TABLE_NAME}").fetchone()[0]
+
+    def get_duplicate_report(self) -> pd.DataFrame:
+        """ Returns rows seen and duplicates (within a chunk and against earlier chunks/runs) per source. """
+        sources = list(self.rows_seen)
+        report = pd.DataFrame({
+            'source': sources,
+            'rows_seen': [self.rows_seen[source] for source in sources],
+            'duplicates_within_chunk': [self.duplicates_within_chunk[source] for source in sources],
+            'duplicates_across_chunks': [self.duplicates_across_chunks[source] for source in sources],
+        })
+        report['duplicates_total'] = report['duplicates_within_chunk'] + report['duplicates_across_chunks']
+        return report
+
+    def clear(self):
+        """ Forget every fingerprint and reset the report. """
+        self.conn.execute(f"DELETE FROM {self.TABLE_NAME}")
+        self.conn.commit()
+        self.rows_seen.clear()
+        self.duplicates_within_chunk.clear()
+        self.duplicates_across_chunks.clear()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,241 @@
+# src/data_preprocess_transform/data_outlier_detection.py
+
+import numpy as np
+import pandas as pd
+
+
+class QuantileSketch:
+    """
+    Mergeable approximate quantile sketch for streaming inputs.
+
+    A simplified t-digest: values are kept as weighted centroids and compressed into at most `compression`
+    equal-weight buckets once the buffer grows, so memory stays bounded regardless of the number of values.
+    Rank error is roughly 1 / compression.
+    """
+
+    def __init__(self, compression=200):
+        if compression < 10:
+            raise ValueError("compression must be at least 10.")
+        self.compression = compression
+        self.means = np.empty(0, dtype='float64')
+        self.weights = np.empty(0, dtype='float64')
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values):
+        """ Add a batch of values (NaN values are ignored). """
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+
+        self.means = np.concatenate([self.means, values])
+        self.weights = np.concatenate([self.weights, np.ones(values.size)])
+        if self.means.size > 4 * self.compression:
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """ Merge another sketch into this one. """
+        self.means = np.concatenate([self.means, other.means])
+        self.weights = np.concatenate([self.weights, other.weights])
+        if self.means.size > 4 * self.compression:
+            self._compress()
+        return self
+
+    def _compress(self):
+        order = np.argsort(self.means, kind='stable')
+        means = self.means[order]
+        weights = self.weights[order]
+
+        cumulative = np.cumsum(weights)
+        total = cumulative[-1]
+        buckets = np.minimum(((cumulative - weights / 2) / total * self.compression).astype('int64'),
+                             self.compression - 1)
+
+        bucket_weights = np.bincount(buckets, weights=weights, minlength=self.compression)
+        bucket_sums = np.bincount(buckets, weights=means * weights, minlength=self.compression)
+        keep = bucket_weights > 0
+
+        self.weights = bucket_weights[keep]
+        self.means = bucket_sums[keep] / self.weights
+
+    def quantile(self, q):
+        """ Approximate quantile(s) for q in [0, 1]. Returns NaN for an empty sketch. """
+        if self.means.size == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+
+        order = np.argsort(self.means, kind='stable')
+        means = self.means[order]
+        weights = self.weights[order]
+        cumulative = np.cumsum(weights)
+        total = cumulative[-1]
+
+        # Rank of each centroid's midpoint, interpolate ranks linearly between centroids
+        midpoints = cumulative - weights / 2
+        if total == 1:
+            return np.full(np.shape(q), means[0]) if np.ndim(q) else means[0]
+        positions = (midpoints - midpoints[0]) / (midpoints[-1] - midpoints[0]) if midpoints[-1] > midpoints[0] \
+            else np.zeros_like(midpoints)
+        return np.interp(q, positions, means)
+
+
+class GroupedQuantileSketch:
+    """
+    One QuantileSketch per group key, updated chunk by chunk.
+    """
+
+    def __init__(self, group_columns, value_column, compression=200):
+        self.group_columns = list(group_columns)
+        self.value_column = value_column
+        self.compression = compression
+        self.sketches = {}
+
+    @staticmethod
+    def _normalize_key(key):
+        # NaN never equals itself, so every chunk would add another NaN group: store missing key parts as None
+        key = key if isinstance(key, tuple) else (key,)
+        return tuple(None if pd.isna(part) else part for part in key)
+
+    def update(self, chunk: pd.DataFrame):
+        values = pd.to_numeric(chunk[self.value_column], errors='coerce')
+        for key, group_values in values.groupby([chunk[c] for c in self.group_columns], sort=False,
+                                                dropna=False, observed=True):
+            key = self._normalize_key(key)
+            sketch = self.sketches.get(key)
+            if sketch is None:
+                sketch = self.sketches[key] = QuantileSketch(self.compression)
+            sketch.update(group_values.to_numpy())
+        return self
+
+    def iqr_bounds(self, k=1.5) -> pd.DataFrame:
+        """ Returns a DataFrame indexed by group key with q1, q3, lower_bound, upper_bound and count. """
+        rows = []
+        for key, sketch in self.sketches.items():
+            q1, q3 = sketch.quantile([0.25, 0.75])
+            iqr = q3 - q1
+            rows.append((*key, q1, q3, q1 - k * iqr, q3 + k * iqr, sketch.count))
+
+        bounds = pd.DataFrame(rows, columns=self.group_columns + ['q1', 'q3', 'lower_bound', 'upper_bound', 'count'])
+        return bounds.set_index(self.group_columns)
+
+
+class DataOutlierDetection:
+    # Depth bands in cm used to group layers, based on the layer mid depth
+    DEFAULT_DEPTH_BANDS = (0, 30, 100, 200, np.inf)
+
+    @staticmethod
+    def assign_depth_band(df, upper_depth_col='upper_depth', lower_depth_col='lower_depth',
+                          depth_bands=DEFAULT_DEPTH_BANDS):
+        """
+        Returns a categorical Series with the depth band ('0-30', '30-100', ...) of every layer's mid depth.
+        """
+        mid_depth = (pd.to_numeric(df[upper_depth_col], errors='coerce') +
+                     pd.to_numeric(df[lower_depth_col], errors='coerce')) / 2
+        labels = [f"{int(upper)}-{'inf' if np.isinf(lower) else int(lower)}"
+                  for upper, lower in zip(depth_bands[:-1], depth_bands[1:])]
+        return pd.cut(mid_depth, bins=list(depth_bands), labels=labels, right=False).rename('depth_band')
+
+    @staticmethod
+    def _group_keys(df, group_columns):
+        return [df[column] for column in group_columns]
+
+    @staticmethod
+    def detect_outliers_grouped(df: pd.DataFrame, value_column: str, group_columns: list, k=1.5) -> pd.Series:
+        """
+        Detect outliers with the IQR method computed per group in a single groupby pass.
+
+        Parameters:
+        df (pd.DataFrame): The DataFrame to check.
+        value_column (str): Numerical column to check, non-numeric values are treated as missing.
+        group_columns (list of str): Columns defining the groups, e.g. ['method_instance', 'depth_band',
+                                     'orgc_dataset_id'].
+        k (float): IQR multiplier for the fences.
+
+        Returns:
+        pd.Series: Boolean mask aligned to df.index, True for outliers. Missing values are never outliers.
+        """
+        values = pd.to_numeric(df[value_column], errors='coerce')
+        grouper = values.groupby(DataOutlierDetection._group_keys(df, group_columns), sort=False,
+                                 dropna=False, observed=True)
+
+        # transform aligns the fences to the rows by label, so groups with missing keys get their own fences
+        q1 = grouper.transform('quantile', 0.25).to_numpy(dtype='float64')
+        q3 = grouper.transform('quantile', 0.75).to_numpy(dtype='float64')
+        iqr = q3 - q1
+        values = values.to_numpy(dtype='float64')
+
+        with np.errstate(invalid='ignore'):
+            mask = (values < q1 - k * iqr) | (values > q3 + k * iqr)
+        return pd.Series(mask, index=df.index, name='is_outlier')
+
+    @staticmethod
+    def build_group_sketches(chunks, value_column: str, group_columns: list, compression=200):
+        """
+        First pass of the streaming mode: feed every chunk into per-group approximate quantile sketches.
+
+        Parameters:
+        chunks (iterable of pd.DataFrame): Input chunks, e.g. from pd.read_csv(..., chunksize=...).
+        value_column (str): Numerical column to check.
+        group_columns (list of str): Columns defining the groups.
+        compression (int): Sketch size per group, higher is more accurate.
+
+        Returns:
+        GroupedQuantileSketch
+        """
+        sketches = GroupedQuantileSketch(group_columns, value_column, compression)
+        for chunk in chunks:
+            sketches.update(chunk)
+        return sketches
+
+    @staticmethod
+    def apply_outlier_bounds(chunk: pd.DataFrame, bounds: pd.DataFrame, value_column: str,
+                             group_columns: list) -> pd.Series:
+        """
+        Second pass of the streaming mode: flag outliers in a chunk using precomputed per-group bounds
+        (see GroupedQuantileSketch.iqr_bounds). Rows of groups without bounds are not flagged.
+        """
+        values = pd.to_numeric(chunk[value_column], errors='coerce').to_numpy(dtype='float64')
+        if len(group_columns) == 1:
+            keys = pd.Index(chunk[group_columns[0]])
+        else:
+            keys = pd.MultiIndex.from_arrays(DataOutlierDetection._group_keys(chunk, group_columns))
+        positions = bounds.index.get_indexer(keys)
+
+        found = positions >= 0
+        lower = np.where(found, bounds['lower_bound'].to_numpy()[positions], -np.inf)
+        upper = np.where(found, bounds['upper_bound'].to_numpy()[positions], np.inf)
+
+        with np.errstate(invalid='ignore'):
+            mask = (values < lower) | (values > upper)
+        return pd.Series(mask, index=chunk.index, name='is_outlier')
+
+    @staticmethod
+    def detect_outliers_chunked(chunks, value_column: str, group_columns: list, k=1.5, compression=200):
+        """
+        Streaming grouped IQR outlier detection for inputs too large to hold in memory.
+
+        Parameters:
+        chunks (callable): Zero-argument callable returning a fresh iterable of DataFrame chunks.
+                           It is called twice, once to build the sketches and once to flag the rows.
+        value_column, group_columns, k, compression: See detect_outliers_grouped and build_group_sketches.
+
+        Yields:
+        pd.Series: Boolean outlier mask for each chunk, in input order.
+        """
+        sketches = DataOutlierDetection.build_group_sketches(chunks(), value_column, group_columns, compression)
+        bounds = sketches.iqr_bounds(k)
+        for chunk in chunks():
+            yield DataOutlierDetection.apply_outlier_bounds(chunk, bounds, value_column, group_columns)
+
+    @staticmethod
+    def summarize_outliers(df: pd.DataFrame, mask: pd.Series, group_columns: list) -> pd.DataFrame:
+        """
+        Count rows and outliers per group for reporting.
+        """
+        summary = mask.groupby(DataOutlierDetection._group_keys(df, group_columns), dropna=False,
+                               observed=True).agg(['size', 'sum'])
+        summary = summary.rename(columns={'size': 'row_count', 'sum': 'outlier_count'}).reset_index()
+        return summary[summary['outlier_count'] > 0].reset_index(drop=True)
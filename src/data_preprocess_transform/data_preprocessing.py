@@ -1,56 +1,148 @@
 # src/data_preprocess_transform/data_preprocessing.py
 
+import logging
+import numbers
+
+import numpy as np
 import pandas as pd
 from dateutil import parser
 
+logger = logging.getLogger(__name__)
+
 
 class DataPreprocessing:
     @staticmethod
     def append_preprocessed_rows(new_rows):
         """ Append the transformed rows back to the DataFrame. """
-        print('\n**************')
-        print(f"Total {len(new_rows)} preprocessed rows to DataFrame.")
-        print('**************\n')
+        logger.info("\n**************")
+        logger.info("Total %s preprocessed rows to DataFrame.", len(new_rows))
+        logger.info("**************\n")
         return pd.DataFrame(new_rows)
 
     @staticmethod
-    def drop_duplicates(df, key_columns=None, df_name='DataFrame'):
+    def compute_row_fingerprints(df, key_columns=None):
+        """
+        Compute a 64-bit fingerprint per row with vectorized hashing.
+
+        Parameters:
+        df (Dataframe): The DataFrame to fingerprint.
+        key_columns (list of str, optional): Columns to hash. All columns if None.
+
+        Columns are hashed as they are, except object columns mixing value types ('mixed' in
+        pd.api.types.infer_dtype): their distinct values are tagged with their kind first, so 1 and '1' get
+        different fingerprints while 1 and 1.0 stay equal, as in DataFrame.drop_duplicates.
+
+        Returns:
+        np.ndarray: uint64 fingerprint per row, in row order.
+        """
+        if key_columns is not None:
+            df = df[key_columns]
+
+        mixed_columns = [column for column in df.columns[df.dtypes == object]
+                         if pd.api.types.infer_dtype(df[column], skipna=True) in DataPreprocessing.MIXED_TYPES]
+        if mixed_columns:
+            # Shallow copy: replacing a column does not copy the other (object) columns
+            df = df.copy(deep=False)
+            for column in mixed_columns:
+                df[column] = DataPreprocessing._kind_tagged(df[column])
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+    # infer_dtype results of object columns whose values hash_pandas_object would stringify into collisions
+    MIXED_TYPES = ('mixed', 'mixed-integer')
+
+    @staticmethod
+    def _value_tag(value):
+        """ '<kind>:<value>': numbers compare by value across int/float/bool, everything else by type and repr. """
+        if isinstance(value, numbers.Number) and not isinstance(value, complex):
+            return f"number:{float(value)!r}"
+        if isinstance(value, str):
+            return f"str:{value}"
+        return f"{type(value).__name__}:{value!r}"
+
+    @staticmethod
+    def _kind_tagged(series):
+        """
+        Kind-tagged strings for a mixed object column, missing values stay None. The tags are built once per
+        distinct value (factorize uses the same equality as drop_duplicates); columns with unhashable cells
+        (lists, dicts) are tagged cell by cell.
+        """
+        try:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        except TypeError:
+            missing = series.isna().to_numpy()
+            tags = series.map(DataPreprocessing._value_tag).to_numpy(dtype=object)
+            tags[missing] = None
+            return pd.Series(tags, index=series.index, dtype=object)
+
+        unique_tags = np.array([DataPreprocessing._value_tag(value) for value in uniques] + [None], dtype=object)
+        # code -1 (missing) picks the trailing None
+        return pd.Series(unique_tags[codes], index=series.index, dtype=object)
+
+    @staticmethod
+    def drop_duplicates(df, key_columns=None, df_name='DataFrame', fingerprint_store=None, source=None):
         """
         Drop duplicate rows based on specified key columns or all columns if not specified.
+        Rows are compared on a 64-bit fingerprint computed once, so wide object columns are hashed a single time.
 
         Parameters:
         df (Dataframe): The DataFrame to process.
         key_columns (list of str, optional): List of column names to identify duplicates.
                                              If None, all columns from dataframe will be used for duplicate detection.
         df_name (str, optional): Name of the df just for logging purposes.
+        fingerprint_store (FingerprintStore, optional): Persistent seen set. When given, rows already seen in
+                                                        earlier chunks or runs are dropped as well.
+        source (str, optional): Source label for the fingerprint store report. Defaults to df_name.
 
         Returns:
         df (DataFrame): The DataFrame with duplicates removed.
         """
-        print(f"\n**************\nProcessing '{df_name}' for duplicate removal...")
+        logger.info("\n**************\nProcessing '%s' for duplicate removal...", df_name)
 
         before_count = len(df)
-        print(f"\nTotal rows before removing duplicates: {before_count}")
+        logger.info("\nTotal rows before removing duplicates: %s", before_count)
 
         if key_columns is None:
-            key_columns = df.columns.tolist()  # Use all columns if no key columns specified
-            print("\nDropping duplicates based on all columns....")
+            logger.info("\nDropping duplicates based on all columns....")
+        else:
+            logger.info("\nDropping duplicates based on %s columns....", key_columns)
+
+        fingerprints = DataPreprocessing.compute_row_fingerprints(df, key_columns)
+        if fingerprint_store is not None:
+            keep_mask = fingerprint_store.filter_new(fingerprints, source or df_name)
         else:
-            print(f"\nDropping duplicates based on {key_columns} columns....")
+            keep_mask = ~pd.Series(fingerprints).duplicated().to_numpy()
 
-        # Drop duplicates based on key_columns and reset index
-        df = df.drop_duplicates(subset=key_columns).reset_index(drop=True)
+        # Drop duplicates based on fingerprints and reset index
+        df = df[keep_mask].reset_index(drop=True)
 
         after_count = len(df)
         deleted_count = before_count - after_count
 
         if deleted_count > 0:
-            print(f"Duplicates removed: {deleted_count}")
+            logger.info("Duplicates removed: %s", deleted_count)
         else:
-            print(f"\nNo Duplicate found in '{df_name}'.\n**************\n")
+            logger.info("\nNo Duplicate found in '%s'.\n**************\n", df_name)
 
         return df
 
+    @staticmethod
+    def drop_duplicates_streaming(chunks, fingerprint_store, key_columns=None, source='stream'):
+        """
+        Deduplicate an iterable of DataFrame chunks against a persistent fingerprint store.
+
+        Parameters:
+        chunks (iterable of DataFrame): Input chunks.
+        fingerprint_store (FingerprintStore): Seen set shared by all chunks (and runs, if disk-backed).
+        key_columns (list of str, optional): Columns identifying duplicates. All columns if None.
+        source (str): Source label for the duplicate report.
+
+        Yields:
+        DataFrame: Each chunk without rows seen before.
+        """
+        for chunk in chunks:
+            fingerprints = DataPreprocessing.compute_row_fingerprints(chunk, key_columns)
+            yield chunk[fingerprint_store.filter_new(fingerprints, source)]
+
     @staticmethod
     def reformat_dates(df, date_column, desired_format='%Y-%m-%d'):
         """
@@ -64,9 +156,9 @@ class DataPreprocessing:
         Returns:
         pd.DataFrame: The DataFrame with reformatted dates.
         """
-        print('\n**************')
-        print(f"Reformatting date column '{date_column}' to format {desired_format}")
-        print('**************\n')
+        logger.info("\n**************")
+        logger.info("Reformatting date column '%s' to format %s", date_column, desired_format)
+        logger.info("**************\n")
 
         def parse_date_safe(date_str):
             """
@@ -84,5 +176,5 @@ class DataPreprocessing:
         # Apply the safe date parsing function
         df[f'reformat_{date_column}'] = df[f'reformat_{date_column}'].apply(parse_date_safe)
 
-        print(f"Finished reformatting date column '{date_column}'.\n")
+        logger.info("Finished reformatting date column '%s'.\n", date_column)
         return df
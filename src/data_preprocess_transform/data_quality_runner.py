@@ -0,0 +1,219 @@
+# src/data_preprocess_transform/data_quality_runner.py
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from statistics import NormalDist
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def run_check_task(function, df, columns, kwargs):
+    """ Run one check (or one column group of a check). Top level so it can be sent to a process pool. """
+    if columns is None:
+        return function(df, **kwargs)
+    return function(df, columns, **kwargs)
+
+
+class QualityCheck:
+    """
+    A named data quality check: function(df, columns, **kwargs), or function(df, **kwargs) when columns is None.
+
+    When `columns` is a list or dict the check can be split into column groups that run as separate tasks; the
+    group results are concatenated. `blocking` receives the check's result DataFrame and returns the rows that are
+    blocking issues (empty when there are none).
+    """
+
+    def __init__(self, name, function, columns=None, kwargs=None, blocking=None, splittable=True):
+        self.name = name
+        self.function = function
+        self.columns = columns
+        self.kwargs = kwargs or {}
+        self.blocking = blocking
+        self.splittable = splittable and columns is not None
+
+    def column_groups(self, group_size):
+        """ Split the columns argument into groups of at most group_size columns. """
+        if not self.splittable or not group_size or len(self.columns) <= group_size:
+            return [self.columns]
+        if isinstance(self.columns, dict):
+            items = list(self.columns.items())
+            return [dict(items[start:start + group_size]) for start in range(0, len(items), group_size)]
+        columns = list(self.columns)
+        return [columns[start:start + group_size] for start in range(0, len(columns), group_size)]
+
+    def find_blocking_issues(self, result):
+        if self.blocking is None or result is None or result.empty:
+            return pd.DataFrame()
+        return self.blocking(result)
+
+    @staticmethod
+    def type_mismatch_in(columns):
+        """ Blocking rule for check_column_data_types: a data_type_mismatch on any of the given columns. """
+        def blocking(result):
+            return result[(result['issue_check_type'] == 'data_type_mismatch')
+                          & result['column_name'].isin(columns)].reset_index(drop=True)
+        return blocking
+
+    @staticmethod
+    def missing_values_in(columns):
+        """ Blocking rule for check_missing_values: any missing value in the given columns. """
+        def blocking(result):
+            return result[(result['missing_count'] > 0) & result['column'].isin(columns)].reset_index(drop=True)
+        return blocking
+
+
+class DataQualityRunner:
+    """
+    Runs independent quality checks concurrently, split over column groups, on a thread or process pool.
+
+    With fail_fast the run stops at the first blocking issue: pending tasks are cancelled and the report is
+    returned immediately (tasks already running finish in the background). run_sampled first validates a
+    Cochran-sized random sample in fail-fast mode and only runs the full validation when the sample passes.
+
+    Threads suit the vectorized checks, which release the GIL inside pandas. The row-wise checks
+    (patterns, lat/long, depth) are GIL-bound and scale with the process pool, at the cost of sending the
+    DataFrame to the worker processes.
+    """
+
+    EXECUTORS = ('threads', 'processes')
+
+    def __init__(self, checks, executor='threads', max_workers=None, column_group_size=4, fail_fast=False):
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unknown QC executor '{executor}'. Expected one of {self.EXECUTORS}.")
+        names = [check.name for check in checks]
+        if len(set(names)) != len(names):
+            raise ValueError("Quality check names must be unique.")
+
+        self.checks = list(checks)
+        self.executor = executor
+        self.max_workers = max_workers
+        self.column_group_size = column_group_size
+        self.fail_fast = fail_fast
+
+    def _create_pool(self):
+        if self.executor == 'processes':
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='qc')
+
+    def run(self, df, fail_fast=None):
+        """
+        Run all checks on df.
+
+        Parameters:
+        df (pd.DataFrame): Data to check.
+        fail_fast (bool, optional): Overrides the runner's fail_fast setting.
+
+        Returns:
+        dict: 'results' {check name: result DataFrame} in check order (completed checks only),
+              'blocking_issues' {check name: blocking rows}, 'failed' (bool), 'incomplete_checks' (list),
+              'cancelled_tasks' (int), 'rows_checked' (int) and 'duration_s' (float).
+        """
+        fail_fast = self.fail_fast if fail_fast is None else fail_fast
+        started_at = time.perf_counter()
+
+        pool = self._create_pool()
+        futures = {}
+        group_results = {check.name: {} for check in self.checks}
+        group_counts = {}
+        for check in self.checks:
+            groups = check.column_groups(self.column_group_size)
+            group_counts[check.name] = len(groups)
+            for group_index, columns in enumerate(groups):
+                future = pool.submit(run_check_task, check.function, df, columns, check.kwargs)
+                futures[future] = (check, group_index)
+
+        blocking_issues = {}
+        cancelled_tasks = 0
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    check, group_index = futures[future]
+                    result = future.result()
+                    group_results[check.name][group_index] = result
+
+                    issues = check.find_blocking_issues(result)
+                    if not issues.empty:
+                        blocking_issues[check.name] = pd.concat(
+                            [blocking_issues.get(check.name, pd.DataFrame()), issues], ignore_index=True)
+
+                if blocking_issues and fail_fast:
+                    cancelled_tasks = sum(future.cancel() for future in pending)
+                    break
+        finally:
+            pool.shutdown(wait=not (blocking_issues and fail_fast), cancel_futures=True)
+
+        results = {}
+        incomplete_checks = []
+        for check in self.checks:
+            completed = group_results[check.name]
+            if len(completed) < group_counts[check.name]:
+                incomplete_checks.append(check.name)
+                continue
+            frames = [completed[group_index] for group_index in range(group_counts[check.name])]
+            non_empty = [frame for frame in frames if not frame.empty]
+            results[check.name] = pd.concat(non_empty, ignore_index=True) if non_empty else frames[0]
+
+        report = {
+            'results': results,
+            'blocking_issues': blocking_issues,
+            'failed': bool(blocking_issues),
+            'incomplete_checks': incomplete_checks,
+            'cancelled_tasks': cancelled_tasks,
+            'rows_checked': len(df),
+            'duration_s': round(time.perf_counter() - started_at, 3),
+        }
+        logger.info("\nQuality checks: %s task(s) for %s check(s) on %s rows with %s in %s s%s",
+                    sum(group_counts.values()), len(self.checks), len(df), self.executor, report['duration_s'],
+                    f", {cancelled_tasks} task(s) cancelled." if cancelled_tasks else ".",
+                    extra={'check_tasks': sum(group_counts.values()), 'rows': len(df),
+                           'duration_s': report['duration_s'], 'cancelled_tasks': cancelled_tasks})
+        for check_name, issues in blocking_issues.items():
+            logger.warning("\nBlocking issue(s) in '%s':\n %s", check_name, issues)
+        return report
+
+    @staticmethod
+    def cochran_sample_size(population, confidence=0.95, margin_of_error=0.05, proportion=0.5):
+        """
+        Cochran's sample size for estimating a proportion, with the finite population correction.
+
+        Parameters:
+        population (int): Number of rows.
+        confidence (float): Confidence level, e.g. 0.95.
+        margin_of_error (float): Accepted absolute error of the estimated proportion of bad rows.
+        proportion (float): Expected proportion, 0.5 is the most conservative.
+
+        Returns:
+        int: Sample size, at most population.
+        """
+        if population <= 0:
+            return 0
+        z_score = NormalDist().inv_cdf((1 + confidence) / 2)
+        base_size = z_score ** 2 * proportion * (1 - proportion) / margin_of_error ** 2
+        sample_size = base_size / (1 + (base_size - 1) / population)
+        return min(population, int(-(-sample_size // 1)))
+
+    def run_sampled(self, df, confidence=0.95, margin_of_error=0.05, random_state=0):
+        """
+        Validate a random sample first (always fail-fast) and reject the data when it has blocking issues.
+        Otherwise run the full validation.
+
+        Returns:
+        dict: The report of the failed sample run (with 'phase' 'sample'), or of the full run ('phase' 'full').
+        """
+        sample_size = self.cochran_sample_size(len(df), confidence, margin_of_error)
+        if sample_size < len(df):
+            logger.info("\nSampling QC: validating %s of %s rows (confidence %s, margin of error %s) first...",
+                        sample_size, len(df), confidence, margin_of_error)
+            sample_report = self.run(df.sample(n=sample_size, random_state=random_state), fail_fast=True)
+            if sample_report['failed']:
+                sample_report['phase'] = 'sample'
+                return sample_report
+
+        report = self.run(df)
+        report['phase'] = 'full'
+        return report
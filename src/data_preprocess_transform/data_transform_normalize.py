@@ -1,12 +1,64 @@
 # src/data_preprocess_transform/data_transform_normalize.py
 
+import logging
+
 import pandas as pd
 import numpy as np
 from src.data_extract.data_extraction import DataExtraction
 from src.data_preprocess_transform.data_preprocessing import DataPreprocessing
 
+logger = logging.getLogger(__name__)
+
 
 class DataTransformNormalize:
+    # Natural keys used to derive the surrogate 'id' of each normalized table
+    METHOD_NATURAL_KEY = ['method_instance', 'orgc_method']
+    PROFILE_NATURAL_KEY = ['profile_id']
+    PROFILE_LAYER_NATURAL_KEY = ['profile_layer_id', 'method_instance', 'orgc_method']
+    # Ids keep the top 53 bits of the 64-bit hash, so they survive float64 round-trips (nullable columns read
+    # back by pandas, NaN-holding exports) exactly
+    ID_BITS = 53
+
+    @staticmethod
+    def hash_natural_keys(df, key_columns):
+        """
+        Vectorized 64-bit hash of natural key columns, shifted to a positive int64 below 2**ID_BITS (exact in
+        float64, fits SQLite INTEGER).
+        Numeric keys are hashed as float64 and other keys as strings, so an int column and its float (NaN-holding)
+        version hash the same.
+        """
+        canonical_keys = pd.DataFrame({
+            column: (df[column].astype('float64') if pd.api.types.is_numeric_dtype(df[column])
+                     else df[column].astype(str).astype(object))
+            for column in key_columns
+        })
+        hashes = pd.util.hash_pandas_object(canonical_keys, index=False).to_numpy()
+        return (hashes >> np.uint64(64 - DataTransformNormalize.ID_BITS)).astype('int64')
+
+    @staticmethod
+    def generate_stable_ids(df, key_columns, df_name='DataFrame'):
+        """
+        Derive deterministic surrogate ids from natural key columns with a vectorized 64-bit hash.
+
+        The id only depends on the key values, not on row order, so chunks and workers can generate ids
+        independently and the same entity keeps its id across runs.
+
+        Parameters:
+        df (pd.DataFrame): DataFrame holding the key columns.
+        key_columns (list of str): Natural key columns.
+        df_name (str): Name of the df for error messages.
+
+        Returns:
+        np.ndarray: Positive int64 id per row.
+        """
+        ids = DataTransformNormalize.hash_natural_keys(df, key_columns)
+
+        # Equal ids for different keys would mean a hash collision, equal ids for equal keys a duplicated entity
+        duplicated_ids = pd.Series(ids).duplicated()
+        if duplicated_ids.any():
+            raise ValueError(f"\n{int(duplicated_ids.sum())} row(s) in '{df_name}' share a surrogate id: the natural "
+                             f"key {key_columns} is not unique.")
+        return ids
 
     @staticmethod
     def transform_data_with_orgc_method_details(df):
@@ -28,6 +80,24 @@ class DataTransformNormalize:
 
         return pd.DataFrame(method_details)
 
+    @staticmethod
+    def take_foreign_keys(parent_ids, positions, fk_name):
+        """
+        Gather parent ids at the positions returned by Index.get_indexer and report unmatched keys (-1).
+
+        Returns:
+        np.ndarray or pd.arrays.IntegerArray: int64 ids, or nullable Int64 ids with <NA> for unmatched rows.
+        """
+        parent_ids = parent_ids.to_numpy()
+        unmatched = positions < 0
+        unmatched_count = int(unmatched.sum())
+        if unmatched_count == 0:
+            return parent_ids[positions]
+
+        logger.warning("\nWarning: %s of %s row(s) have no matching parent for '%s', their '%s' is left empty.",
+                       unmatched_count, len(positions), fk_name, fk_name)
+        return pd.arrays.IntegerArray(np.where(unmatched, 0, parent_ids[positions]).astype('int64'), unmatched)
+
     @staticmethod
     def normalize_dataframes(df):
 
@@ -41,14 +111,16 @@ class DataTransformNormalize:
                                                            "orgc_method_normalized_df")
 
         # Add 'id' column
-        orgc_method_df['id'] = range(1, len(orgc_method_df) + 1)
+        orgc_method_df['id'] = DataTransformNormalize.generate_stable_ids(
+            orgc_method_df, DataTransformNormalize.METHOD_NATURAL_KEY, 'orgc_method_df')
 
         # Rename columns
         orgc_method_df = orgc_method_df.rename(columns={'sample pretreatment': 'sample_pretreatment'})
-        # Reorder columns to have 'id' as the first column
-        orgc_method_df = orgc_method_df[['id', 'method_instance', 'calculation', 'detection', 'reaction',
-                                         'sample_pretreatment', 'spectral', 'temperature', 'treatment',
-                                         'orgc_method']].reset_index(drop=True)
+        # Reorder columns to have 'id' as the first column. Attributes no method string mentions (e.g. 'spectral'
+        # in a partition of the data) are added as empty columns
+        orgc_method_df = orgc_method_df.reindex(columns=['id', 'method_instance', 'calculation', 'detection',
+                                                         'reaction', 'sample_pretreatment', 'spectral', 'temperature',
+                                                         'treatment', 'orgc_method']).reset_index(drop=True)
         # Convert data types
         columns_to_str = ['calculation', 'detection', 'reaction', 'sample_pretreatment',
                           'spectral', 'temperature', 'treatment', 'orgc_method']
@@ -65,7 +137,8 @@ class DataTransformNormalize:
         orgc_profile_df = DataPreprocessing.drop_duplicates(orgc_profile_df, df_name='profile_df')
 
         # Generate 'id' column for orgc_profile_df
-        orgc_profile_df['id'] = range(1, len(orgc_profile_df) + 1)
+        orgc_profile_df['id'] = DataTransformNormalize.generate_stable_ids(
+            orgc_profile_df, DataTransformNormalize.PROFILE_NATURAL_KEY, 'orgc_profile_df')
 
         # Convert data types
         columns_to_str = ['orgc_profile_code']
@@ -80,47 +153,38 @@ class DataTransformNormalize:
         # orgc_profile_layer_df: 'profile_layer_id', 'orgc_profile_id', 'upper_depth', 'lower_depth',
         # 'layer_name', 'litter', 'orgc_method_id', 'orgc_value', 'orgc_value_avg', 'orgc_date'
 
-        orgc_profile_layer_df = df[['profile_layer_id', 'upper_depth', 'lower_depth',
-                                    'layer_name', 'litter', 'orgc_value_for_instance', 'orgc_value_avg',
-                                    'reformat_orgc_date_for_instance', 'method_instance', 'orgc_method',
-                                    'profile_id']].reset_index(drop=True)
-
-        # Rename columns
-        orgc_profile_layer_df = orgc_profile_layer_df.rename(columns={'orgc_value_for_instance': 'orgc_value',
-                                                                      'X': 'latitude', 'Y': 'longitude',
-                                                                      'reformat_orgc_date_for_instance': 'orgc_date'})
-
-        # merge orgc_profile_layer_df with orgc_profile_df to get id as orgc_profile_id for (profile_id)
-
-        # merge profile_layer_df with profile_layer_matrix_df to get id as profile_layer_id for ()
-        orgc_profile_layer_df = orgc_profile_layer_df.merge(orgc_profile_df[['id', 'profile_id']],
-                                                            left_on='profile_id',
-                                                            right_on='profile_id',
-                                                            how='left')
-        # rename merged id column
-        orgc_profile_layer_df = orgc_profile_layer_df.rename(columns={'id': 'orgc_profile_id', })
-
-        # merge orgc_profile_layer_df with orgc_method_df to get id as orgc_method_id for (orgc_method, method_instance)
-        orgc_profile_layer_df = orgc_profile_layer_df.merge(orgc_method_df[['id', 'method_instance', 'orgc_method']],
-                                                            left_on=['method_instance', 'orgc_method'],
-                                                            right_on=['method_instance', 'orgc_method'],
-                                                            how='left')
-        # rename merged id column
-        orgc_profile_layer_df = orgc_profile_layer_df.rename(columns={'id': 'orgc_method_id', })
-
-        # Add 'id' column for orgc_profile_layer_df
-        orgc_profile_layer_df['id'] = range(1, len(orgc_profile_layer_df) + 1)
-
-        # Reorder columns
-        orgc_profile_layer_df = orgc_profile_layer_df[['id', 'profile_layer_id', 'orgc_profile_id', 'upper_depth',
-                                                       'lower_depth', 'layer_name', 'litter',
-                                                       'orgc_method_id', 'orgc_value', 'orgc_value_avg',
-                                                       'orgc_date']].reset_index(drop=True)
-
-        # Convert data types
-        orgc_profile_layer_df['orgc_method_id'] = pd.to_numeric(orgc_profile_layer_df['orgc_method_id'],
-                                                                errors='coerce',
-                                                                downcast='integer')
+        # Resolve orgc_profile_id for (profile_id) through an index lookup on the profile table
+        profile_positions = pd.Index(orgc_profile_df['profile_id']).get_indexer(df['profile_id'])
+
+        # Resolve orgc_method_id for (method_instance, orgc_method) through integer method codes: the long method
+        # strings are looked up once in the few distinct strings of the method table (-1 when unknown), then
+        # (code, method_instance) pairs are matched on an integer MultiIndex
+        method_string_index = pd.Index(orgc_method_df['orgc_method'].unique())
+        method_key_index = pd.MultiIndex.from_arrays([method_string_index.get_indexer(orgc_method_df['orgc_method']),
+                                                      orgc_method_df['method_instance'].to_numpy()])
+        method_positions = method_key_index.get_indexer(pd.MultiIndex.from_arrays(
+            [method_string_index.get_indexer(df['orgc_method']), df['method_instance'].to_numpy()]))
+
+        orgc_profile_id = DataTransformNormalize.take_foreign_keys(orgc_profile_df['id'], profile_positions,
+                                                                  'orgc_profile_id')
+        orgc_method_id = DataTransformNormalize.take_foreign_keys(orgc_method_df['id'], method_positions,
+                                                                 'orgc_method_id')
+
+        # Build the layer table in one allocation, columns already in SQL schema order
+        orgc_profile_layer_df = pd.DataFrame({
+            'id': DataTransformNormalize.generate_stable_ids(
+                df, DataTransformNormalize.PROFILE_LAYER_NATURAL_KEY, 'orgc_profile_layer_df'),
+            'profile_layer_id': df['profile_layer_id'].array,
+            'orgc_profile_id': orgc_profile_id,
+            'upper_depth': df['upper_depth'].array,
+            'lower_depth': df['lower_depth'].array,
+            'layer_name': df['layer_name'].array,
+            'litter': df['litter'].array,
+            'orgc_method_id': orgc_method_id,
+            'orgc_value': df['orgc_value_for_instance'].array,
+            'orgc_value_avg': df['orgc_value_avg'].array,
+            'orgc_date': df['reformat_orgc_date_for_instance'].array,
+        })
 
         # Reorder data tables as per the sql schema structure
 
@@ -134,10 +198,6 @@ class DataTransformNormalize:
                                            'orgc_dataset_id', 'latitude', 'longitude',
                                            'country_name']].reset_index(drop=True)
 
-        orgc_profile_layer_df = orgc_profile_layer_df[['id', 'profile_layer_id', 'orgc_profile_id',
-                                                       'upper_depth', 'lower_depth', 'layer_name',
-                                                       'litter', 'orgc_method_id', 'orgc_value',
-                                                       'orgc_value_avg', 'orgc_date']].reset_index(drop=True)
         return {
             'orgc_method_df': orgc_method_df,
             'orgc_profile_df': orgc_profile_df,
@@ -0,0 +1,203 @@
+# src/data_preprocess_transform/profile_layer_index.py
+
+import numpy as np
+import pandas as pd
+
+
+class ProfileLayerIndex:
+    """
+    Compact layer-stack index over the normalized tables.
+
+    Layers are sorted by (profile_id, upper_depth, lower_depth) into flat NumPy arrays, and `offsets` holds the
+    CSR-style boundaries of every profile's stack: the layers of profile_ids[i] are rows offsets[i]:offsets[i + 1].
+    All queries take arrays of profiles and depths and are answered with vectorized binary searches.
+
+    The normalized layer table has one row per layer and method instance. By default these rows are collapsed
+    into one physical layer per profile_layer_id (orgc_value averaged over methods). Pass `method_id` to build the
+    stack of a single method instead.
+    """
+
+    def __init__(self, profile_ids, offsets, profile_layer_id, upper_depth, lower_depth, orgc_value):
+        self.profile_ids = profile_ids
+        self.offsets = offsets
+        self.profile_layer_id = profile_layer_id
+        self.upper_depth = upper_depth
+        self.lower_depth = lower_depth
+        self.orgc_value = orgc_value
+
+        # Stack number of every layer, used to build composite (stack, depth) search keys
+        self.stack_position = np.repeat(np.arange(len(profile_ids)), np.diff(offsets))
+        depths = np.concatenate([upper_depth, lower_depth])
+        self._depth_origin = float(np.nanmin(depths)) if depths.size else 0.0
+        self._depth_span = float(np.nanmax(depths)) - self._depth_origin + 1.0 if depths.size else 1.0
+        self._upper_keys = self._composite_key(self.stack_position, upper_depth)
+
+        # Interpolation uses the mid depth of the layers that have a value, sorted per stack
+        mid_depth = (upper_depth + lower_depth) / 2
+        has_value = ~np.isnan(orgc_value) & ~np.isnan(mid_depth)
+        order = np.lexsort((mid_depth[has_value], self.stack_position[has_value]))
+        self._mid_depth = mid_depth[has_value][order]
+        self._mid_value = orgc_value[has_value][order]
+        mid_stack = self.stack_position[has_value][order]
+        self._mid_keys = self._composite_key(mid_stack, self._mid_depth)
+        self._mid_offsets = np.searchsorted(mid_stack, np.arange(len(profile_ids) + 1))
+
+    def __len__(self):
+        return len(self.profile_ids)
+
+    def _composite_key(self, stack_position, depth):
+        # Depths are shifted into [0, span) so every stack gets its own non-overlapping key range
+        return stack_position * self._depth_span + (np.asarray(depth, dtype='float64') - self._depth_origin)
+
+    @classmethod
+    def from_normalized(cls, df_normalized_dict, method_id=None):
+        """
+        Build the index from the output of DataTransformNormalize.normalize_dataframes.
+
+        Parameters:
+        df_normalized_dict (dict): Must hold 'orgc_profile_df' and 'orgc_profile_layer_df'.
+        method_id (int, optional): Only use the layers of this orgc_method_id.
+
+        Returns:
+        ProfileLayerIndex
+        """
+        layer_df = df_normalized_dict['orgc_profile_layer_df']
+        profile_df = df_normalized_dict['orgc_profile_df']
+
+        if method_id is not None:
+            layer_df = layer_df[layer_df['orgc_method_id'] == method_id]
+
+        profile_positions = pd.Index(profile_df['id']).get_indexer(layer_df['orgc_profile_id'])
+        known = profile_positions >= 0
+
+        layers = pd.DataFrame({
+            'profile_id': profile_df['profile_id'].to_numpy()[profile_positions[known]],
+            'profile_layer_id': layer_df['profile_layer_id'].to_numpy()[known],
+            'upper_depth': pd.to_numeric(layer_df['upper_depth'], errors='coerce').to_numpy(dtype='float64')[known],
+            'lower_depth': pd.to_numeric(layer_df['lower_depth'], errors='coerce').to_numpy(dtype='float64')[known],
+            'orgc_value': pd.to_numeric(layer_df['orgc_value'], errors='coerce').to_numpy(dtype='float64')[known],
+        })
+        if method_id is None:
+            layers = layers.groupby(['profile_id', 'profile_layer_id'], sort=False, as_index=False).agg(
+                upper_depth=('upper_depth', 'first'), lower_depth=('lower_depth', 'first'),
+                orgc_value=('orgc_value', 'mean'))
+
+        order = np.lexsort((layers['lower_depth'].to_numpy(), layers['upper_depth'].to_numpy(),
+                            layers['profile_id'].to_numpy()))
+        layers = layers.iloc[order]
+
+        sorted_profile_ids = layers['profile_id'].to_numpy()
+        profile_ids = np.unique(sorted_profile_ids)
+        offsets = np.searchsorted(sorted_profile_ids, profile_ids)
+        offsets = np.append(offsets, len(sorted_profile_ids)).astype('int64')
+
+        return cls(profile_ids, offsets,
+                   layers['profile_layer_id'].to_numpy(),
+                   layers['upper_depth'].to_numpy(),
+                   layers['lower_depth'].to_numpy(),
+                   layers['orgc_value'].to_numpy())
+
+    def _stack_positions(self, profile_ids):
+        """ Position of each profile in `profile_ids` within the index, -1 when unknown. """
+        profile_ids = np.asarray(profile_ids)
+        positions = np.searchsorted(self.profile_ids, profile_ids)
+        positions = np.minimum(positions, len(self.profile_ids) - 1) if len(self.profile_ids) else positions
+        found = (positions < len(self.profile_ids)) & (self.profile_ids[positions] == profile_ids) \
+            if len(self.profile_ids) else np.zeros(profile_ids.shape, dtype=bool)
+        return np.where(found, positions, -1)
+
+    def get_stack(self, profile_id) -> pd.DataFrame:
+        """ The depth-sorted layers of one profile. """
+        position = self._stack_positions([profile_id])[0]
+        if position < 0:
+            raise KeyError(f"Profile '{profile_id}' not found in the layer index.")
+        rows = slice(self.offsets[position], self.offsets[position + 1])
+        return pd.DataFrame({
+            'profile_layer_id': self.profile_layer_id[rows],
+            'upper_depth': self.upper_depth[rows],
+            'lower_depth': self.lower_depth[rows],
+            'orgc_value': self.orgc_value[rows],
+        })
+
+    def layer_at_depth(self, profile_ids, depths):
+        """
+        Find the layer containing each depth (upper_depth <= depth < lower_depth).
+
+        Where layers overlap, the layer with the deepest upper_depth at or above the depth is tested.
+
+        Returns:
+        np.ndarray: Row number into the index arrays for each query, -1 when no layer contains the depth.
+        """
+        profile_ids, depths = np.broadcast_arrays(np.asarray(profile_ids), np.asarray(depths, dtype='float64'))
+        positions = self._stack_positions(profile_ids)
+        known = positions >= 0
+
+        candidates = np.searchsorted(self._upper_keys, self._composite_key(positions, depths), side='right') - 1
+        starts = np.where(known, self.offsets[np.maximum(positions, 0)], 0)
+
+        found = known & (candidates >= starts) & ~np.isnan(depths)
+        candidates = np.clip(candidates, 0, max(len(self._upper_keys) - 1, 0))
+        if len(self._upper_keys):
+            found &= depths < self.lower_depth[candidates]
+        return np.where(found, candidates, -1)
+
+    def value_at_depth(self, profile_ids, depths):
+        """ orgc_value of the layer containing each depth, NaN in gaps, below the profile or for unknown profiles. """
+        rows = self.layer_at_depth(profile_ids, depths)
+        if not len(self.orgc_value):
+            return np.full(rows.shape, np.nan)
+        return np.where(rows >= 0, self.orgc_value[np.maximum(rows, 0)], np.nan)
+
+    def interpolate(self, profile_ids, depths):
+        """
+        orgc_value linearly interpolated between layer mid depths of each profile. Depths above the first or
+        below the last mid depth take the nearest layer's value. NaN for profiles without any value.
+        """
+        profile_ids, depths = np.broadcast_arrays(np.asarray(profile_ids), np.asarray(depths, dtype='float64'))
+        positions = self._stack_positions(profile_ids)
+        safe_positions = np.maximum(positions, 0)
+        starts = self._mid_offsets[safe_positions]
+        ends = self._mid_offsets[safe_positions + 1]
+        valid = (positions >= 0) & (ends > starts) & ~np.isnan(depths)
+        if not len(self._mid_keys):
+            return np.full(depths.shape, np.nan)
+
+        right = np.searchsorted(self._mid_keys, self._composite_key(positions, depths), side='right')
+        right = np.clip(right, starts, np.maximum(ends - 1, starts))
+        left = np.clip(right - 1, starts, np.maximum(ends - 1, starts))
+        last = len(self._mid_keys) - 1
+        left, right = np.minimum(left, last), np.minimum(right, last)
+
+        left_depth, right_depth = self._mid_depth[left], self._mid_depth[right]
+        left_value, right_value = self._mid_value[left], self._mid_value[right]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.clip((depths - left_depth) / (right_depth - left_depth), 0.0, 1.0)
+        weight = np.where(right_depth > left_depth, weight, 0.0)
+        # Above the first mid depth: left and right are both the first layer, weight stays 0
+        values = left_value + weight * (right_value - left_value)
+        values = np.where(depths >= right_depth, right_value, values)
+        return np.where(valid, values, np.nan)
+
+    def _adjacent_layers(self):
+        same_stack = self.stack_position[1:] == self.stack_position[:-1]
+        return pd.DataFrame({
+            'profile_id': self.profile_ids[self.stack_position[1:]] if len(self.stack_position) else [],
+            'profile_layer_id': self.profile_layer_id[:-1],
+            'next_profile_layer_id': self.profile_layer_id[1:],
+            'lower_depth': self.lower_depth[:-1],
+            'next_upper_depth': self.upper_depth[1:],
+        })[same_stack]
+
+    def find_gaps(self) -> pd.DataFrame:
+        """ Consecutive layers of a profile with missing depth between them (next upper_depth > lower_depth). """
+        adjacent = self._adjacent_layers()
+        gaps = adjacent[adjacent['next_upper_depth'] > adjacent['lower_depth']].copy()
+        gaps['gap_thickness'] = gaps['next_upper_depth'] - gaps['lower_depth']
+        return gaps.reset_index(drop=True)
+
+    def find_overlaps(self) -> pd.DataFrame:
+        """ Consecutive layers of a profile that overlap (next upper_depth < lower_depth). """
+        adjacent = self._adjacent_layers()
+        overlaps = adjacent[adjacent['next_upper_depth'] < adjacent['lower_depth']].copy()
+        overlaps['overlap_thickness'] = overlaps['lower_depth'] - overlaps['next_upper_depth']
+        return overlaps.reset_index(drop=True)
@@ -1,37 +1,221 @@
 # main.py
 
+import argparse
+import logging
+import os
+import sqlite3
+
 from data_extract.data_extraction import DataExtraction
 
 from src.data_preprocess_transform.data_quality_checker import DataQualityChecker
+from src.data_preprocess_transform.data_quality_runner import DataQualityRunner, QualityCheck
 from src.data_preprocess_transform.data_preprocessing import DataPreprocessing
+from src.data_preprocess_transform.data_outlier_detection import DataOutlierDetection
 from src.data_preprocess_transform.data_transform_normalize import DataTransformNormalize
+from src.data_preprocess_transform.profile_layer_index import ProfileLayerIndex
 from src.data_load.data_loading import DataLoading
+from src.data_load.columnar_store import ColumnarStore
+from src.data_load.run_manifest import RunManifest
+from src.pipeline_profiler import PipelineProfiler
+from src.pipeline_executor import PartitionedExecutor
+from src.pipeline_logging import LOG_FORMATS, LOG_LEVELS, StageTimer, configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+def parse_arguments(argv=None):
+    """ Parse the pipeline command line options. """
+    arg_parser = argparse.ArgumentParser(description="Seqana soil data ETL pipeline.")
+    arg_parser.add_argument('--columnar-dir', default=None,
+                            help="Also export the normalized layer table as memory-mappable .npy columns "
+                                 "into this directory.")
+    arg_parser.add_argument('--force', action='store_true',
+                            help="Run the full pipeline even if the run manifest shows nothing changed.")
+    arg_parser.add_argument('--verify-only', action='store_true',
+                            help="Only verify the loaded tables against the latest run manifest, then exit.")
+    arg_parser.add_argument('--verify-tables', action='store_true',
+                            help="Also recompute the table checksums when checking whether the run can be skipped.")
+    arg_parser.add_argument('--profile', nargs='?', const='run', default=None,
+                            help="Profile the pipeline. Without value the whole run is profiled, otherwise a "
+                                 f"comma separated list of stages ({', '.join(PipelineProfiler.STAGES)}) or 'all'.")
+    arg_parser.add_argument('--profile-mode', choices=PipelineProfiler.MODES, default='cprofile',
+                            help="cprofile (deterministic) or sampling (low overhead).")
+    arg_parser.add_argument('--profile-dir', default='profiles',
+                            help="Output directory for .pstats, collapsed stacks and the profiling report.")
+    arg_parser.add_argument('--profile-top', type=int, default=15,
+                            help="Number of hot functions per stage in the profiling report.")
+    arg_parser.add_argument('--log-level', choices=LOG_LEVELS, default='INFO',
+                            help="Minimum log level. DEBUG adds the DataFrame reviews of every stage.")
+    arg_parser.add_argument('--log-format', choices=LOG_FORMATS, default='text',
+                            help="text (plain messages) or json (one JSON object per line with stage, rows and "
+                                 "duration fields).")
+    arg_parser.add_argument('--quiet', action='store_true',
+                            help="Only log warnings and errors.")
+    arg_parser.add_argument('--qc-fail-fast', action='store_true',
+                            help="Stop at the first blocking quality issue (wrong type or missing key column) and "
+                                 "reject the raw data without loading (exit status 1).")
+    arg_parser.add_argument('--qc-sample', action='store_true',
+                            help="Validate a statistically sized random sample first and reject the raw data early "
+                                 "when it has blocking issues.")
+    arg_parser.add_argument('--qc-executor', choices=DataQualityRunner.EXECUTORS, default='threads',
+                            help="Pool used to run the quality checks concurrently.")
+    arg_parser.add_argument('--qc-workers', type=int, default=None,
+                            help="Number of quality check workers.")
+    arg_parser.add_argument('--chunk-size', type=int, default=None,
+                            help="Load into SQLite in resumable chunks of this many rows, committing after each chunk.")
+    arg_parser.add_argument('--backend', choices=PartitionedExecutor.BACKENDS, default=None,
+                            help="Run preprocessing and normalization over partitions on this execution backend "
+                                 "instead of in a single pass.")
+    arg_parser.add_argument('--partitions', type=int, default=4,
+                            help="Number of partitions for --backend.")
+    arg_parser.add_argument('--partition-column', choices=PartitionedExecutor.PARTITION_COLUMNS,
+                            default='profile_id', help="Raw data column used to partition for --backend.")
+    arg_parser.add_argument('--workers', type=int, default=None,
+                            help="Worker processes/threads for --backend.")
+    arg_parser.add_argument('--scheduler-address', default=None,
+                            help="Dask scheduler or Ray cluster address. A local cluster is started if omitted.")
+    args = arg_parser.parse_args(argv)
+    if args.backend and args.profile and 'normalize' in args.profile.split(','):
+        arg_parser.error("--profile normalize cannot be used with --backend: the partitions are normalized inside "
+                         "the 'preprocess' stage, profile 'preprocess' instead.")
+    return args
+
+
+def check_run_manifest(db_file_name, source_hash, pipeline_version, config_hash, verify_only=False,
+                       verify_tables=False):
+    """
+    Compare the current run with the latest run manifest stored in the database.
+    Returns True when the load can be skipped (or, with verify_only, when the tables match the manifest).
+    The skip check only compares hashes unless verify_tables is set. A chunked load left in progress always
+    requires a new run, whatever the manifest says.
+    """
+    db_file_path = DataLoading.get_db_file_path(db_file_name)
+    if not os.path.exists(db_file_path):
+        logger.info("\nNo database found, full run required.")
+        return False
+
+    conn = sqlite3.connect(db_file_path)
+    try:
+        interrupted_tables = [table_name for table_name, state in DataLoading.get_load_state(conn).items()
+                              if state['status'] == 'in_progress']
+        if interrupted_tables:
+            logger.info("\nRun manifest check: an interrupted chunked load is in progress for %s.",
+                        interrupted_tables)
+            return False
+
+        if verify_only:
+            latest_manifest = RunManifest.get_latest(conn)
+            if latest_manifest is None:
+                logger.info("\nNo run manifest found to verify against.")
+                return False
+            mismatched_tables = RunManifest.verify_tables(conn, latest_manifest)
+            if mismatched_tables:
+                logger.warning("\nTables differ from the run manifest: %s", mismatched_tables)
+                return False
+            logger.info("\nAll tables match the run manifest from %s.", latest_manifest['created_at'])
+            return True
+
+        up_to_date, reason = RunManifest.check_up_to_date(conn, source_hash, pipeline_version, config_hash,
+                                                          verify_tables=verify_tables)
+        logger.info("\nRun manifest check: %s.", reason)
+        return up_to_date
+    finally:
+        conn.close()
+
+
+def review_preprocessed_data(extract, df_preprocessed, upper_depth_col='upper_depth', lower_depth_col='lower_depth'):
+    """
+    Quality review of the preprocessed rows, shared by the single pass and the partitioned backends: grouped IQR
+    outliers on the exploded orgc values and, at debug level, the DataFrame reviews.
+    """
+    # DataQuality check: IQR outliers per (method, depth band, dataset) on the exploded orgc values
+    depth_band = DataOutlierDetection.assign_depth_band(df_preprocessed, upper_depth_col, lower_depth_col)
+    df_outlier_check = df_preprocessed.assign(depth_band=depth_band)
+    outlier_group_columns = ['orgc_method', 'method_instance', 'depth_band', 'orgc_dataset_id']
+    grouped_outlier_mask = DataOutlierDetection.detect_outliers_grouped(df_outlier_check, 'orgc_value_for_instance',
+                                                                        outlier_group_columns)
+    logger.info("\nGrouped outliers in 'orgc_value_for_instance': %s of %s rows.",
+                int(grouped_outlier_mask.sum()), len(grouped_outlier_mask))
+    logger.info("%s", DataOutlierDetection.summarize_outliers(df_outlier_check, grouped_outlier_mask,
+                                                              ['method_instance', 'depth_band', 'orgc_dataset_id']))
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("\nAnalyzing the preprocessed dataframe...")
+        review_raw_df = extract.generate_review_dataframes(df_preprocessed)
+        for name, df in review_raw_df.items():
+            logger.debug("\n%s:\n %s \n%s", name, df, '-' * 80)
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    configure_logging(level=args.log_level, log_format=args.log_format, quiet=args.quiet)
+    profiler = PipelineProfiler(stages=args.profile.split(',') if args.profile else None,
+                                mode=args.profile_mode, output_dir=args.profile_dir, top_n=args.profile_top)
+    stage_timer = StageTimer(logger)
+    try:
+        profiler.enter_stage('run')
+        return run_pipeline(args, profiler, stage_timer)
+    finally:
+        stage_timer.finish()
+        profiler.finish()
+
 
+def run_pipeline(args, profiler, stage_timer):
+    def enter_stage(stage):
+        profiler.enter_stage(stage)
+        stage_timer.enter_stage(stage)
 
-def main():
     file_name = 'seqana-data-engineering-challenge-data-wosis-belgium.xlsx'
+    sql_script_file_name = 'initialize_db.sql'
+    db_file_name = 'seqana_soil_data.db'
+
+    # Step 0: Skip the run when source file, pipeline code and configuration are unchanged since the last load
+    run_config = {
+        'file_name': file_name,
+        'sql_script_file_name': sql_script_file_name,
+        'db_file_name': db_file_name,
+        'columnar_dir': args.columnar_dir,
+        'backend': args.backend,
+        'partitions': args.partitions,
+        'partition_column': args.partition_column,
+    }
+    source_hash = RunManifest.compute_file_hash(DataExtraction.get_dataset_file_path(file_name))
+    pipeline_version = RunManifest.compute_pipeline_version(os.path.join(os.getcwd(), sql_script_file_name))
+    config_hash = RunManifest.compute_config_hash(run_config)
+
+    if args.verify_only:
+        return check_run_manifest(db_file_name, source_hash, pipeline_version, config_hash, verify_only=True)
+    if not args.force and check_run_manifest(db_file_name, source_hash, pipeline_version, config_hash,
+                                             verify_tables=args.verify_tables):
+        logger.info("Nothing new to load, exiting.")
+        return True
 
     # Initialize Preprocessor and transformer and data_load Classes
     extract = DataExtraction()
-    dataqualitychecker = DataQualityChecker()
     preprocessor = DataPreprocessing()
     transformer = DataTransformNormalize()
     dataloader = DataLoading()
 
     # Step 1: Extraction of raw data into raw_df and apply data quality checks
+    enter_stage('extract')
 
-    print(f"\nStarting Extract the raw data from the {file_name}...")
+    logger.info("\nStarting Extract the raw data from the %s...", file_name)
     raw_df = extract.read_raw_data(file_name)
-    print("Extraction finishes...\n")
+    logger.info("Extraction finishes...\n")
+
+    stage_timer.record(rows=len(raw_df))
 
-    print("\nAnalyzing the raw data...")
-    review_raw_df = extract.generate_review_dataframes(raw_df)
-    for name, df in review_raw_df.items():
-        print(f"\n{name}:\n", df, "\n" + "-" * 80)
+    # DataFrame reviews are only computed and formatted when debug logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("\nAnalyzing the raw data...")
+        review_raw_df = extract.generate_review_dataframes(raw_df)
+        for name, df in review_raw_df.items():
+            logger.debug("\n%s:\n %s \n%s", name, df, '-' * 80)
 
     # DataQuality checks on Metadata Level
+    enter_stage('quality_checks')
 
-    print("\n************\nDataQuality checks on Metadata Level begins.......")
+    logger.info("\n************\nDataQuality checks on Metadata Level begins.......")
     # Expected Data types check in raw data
     desired_column_types = {
         'X': 'float',
@@ -51,15 +235,6 @@ def main():
         'orgc_profile_code': 'object',
     }
 
-    # Check column data types
-    data_type_check_results = dataqualitychecker.check_column_data_types(raw_df, desired_column_types)
-    if (data_type_check_results['issue_check_type'] == 'data_type_match').all():
-        print("\nAll columns have the expected data types in raw data.\n")
-        print(data_type_check_results)
-    else:
-        print("\nData type mismatches found in:\n")
-        print(data_type_check_results[data_type_check_results['issue_check_type'] == 'data_type_mismatch'].reset_index(drop=True))
-
     # Check for column patterns in special valued column
     column_patterns = {
         'orgc_value': r'\{(?:\d+:\s*[^,]+(?:,\s*)?)+\}',
@@ -67,22 +242,6 @@ def main():
         'orgc_method': ''  # only check valid dictionary as valid string in orgc_method
     }
 
-    # Match orgc_value, orgc_date, orgc_method column defined patterns
-    pattern_check_results = dataqualitychecker.check_column_patterns(raw_df, column_patterns)
-
-    if pattern_check_results.empty:
-        print(f"\nColumns {column_patterns.keys()} match the expected patterns.")
-    else:
-        print("\nPattern mismatches found:")
-        print(pattern_check_results)
-
-    print("\n************\nDataQuality checks on Raw Data Level begins.......")
-
-    # Check for duplicate records
-    preprocessor.drop_duplicates(raw_df, df_name='raw_extracted_dataframe')
-
-    # DataQuality checks on Data Level
-
     # Define columns for different checks
     col_to_check_for_outliers = ['orgc_value_avg']
     col_to_check_for_missing_values = ['X', 'Y', 'profile_id', 'profile_layer_id', 'country_name',
@@ -94,81 +253,190 @@ def main():
     upper_depth_col = 'upper_depth'  # upper depth column name
     lower_depth_col = 'lower_depth'  # lower depth column name
 
+    # Key columns: a wrong type or a missing value here makes the delivery unusable
+    key_columns = ['profile_id', 'profile_layer_id', upper_depth_col, lower_depth_col]
+
+    # The checks are independent and run concurrently over column groups
+    quality_checks = [
+        QualityCheck('data_types', DataQualityChecker.check_column_data_types, desired_column_types,
+                     blocking=QualityCheck.type_mismatch_in(key_columns)),
+        QualityCheck('patterns', DataQualityChecker.check_column_patterns, column_patterns),
+        QualityCheck('outliers', DataQualityChecker.check_outliers, col_to_check_for_outliers),
+        QualityCheck('missing_values', DataQualityChecker.check_missing_values, col_to_check_for_missing_values,
+                     blocking=QualityCheck.missing_values_in(key_columns[:2])),
+        QualityCheck('lat_long', DataQualityChecker.check_lat_long,
+                     kwargs={'lat_column': lat_column, 'long_column': long_column}),
+        QualityCheck('depth', DataQualityChecker.check_depth_columns,
+                     kwargs={'upper_depth_col': upper_depth_col, 'lower_depth_col': lower_depth_col}),
+    ]
+    qc_runner = DataQualityRunner(quality_checks, executor=args.qc_executor, max_workers=args.qc_workers,
+                                  fail_fast=args.qc_fail_fast)
+    qc_report = qc_runner.run_sampled(raw_df) if args.qc_sample else qc_runner.run(raw_df)
+    if qc_report['failed'] and (args.qc_fail_fast or qc_report.get('phase') == 'sample'):
+        logger.error("\nRaw data rejected by the quality checks: blocking issue(s) in %s. Nothing was loaded.",
+                     list(qc_report['blocking_issues']))
+        return False
+    qc_results = qc_report['results']
+    stage_timer.record(rows=qc_report['rows_checked'], blocking_issues=len(qc_report['blocking_issues']))
+
+    # Check column data types
+    data_type_check_results = qc_results['data_types']
+    if (data_type_check_results['issue_check_type'] == 'data_type_match').all():
+        logger.info("\nAll columns have the expected data types in raw data.\n")
+        logger.info("%s", data_type_check_results)
+    else:
+        logger.info("\nData type mismatches found in:\n")
+        logger.info("%s", data_type_check_results[data_type_check_results['issue_check_type'] == 'data_type_mismatch']
+                    .reset_index(drop=True))
+
+    # Match orgc_value, orgc_date, orgc_method column defined patterns
+    pattern_check_results = qc_results['patterns']
+
+    if pattern_check_results.empty:
+        logger.info("\nColumns %s match the expected patterns.", column_patterns.keys())
+    else:
+        logger.info("\nPattern mismatches found:")
+        logger.info("%s", pattern_check_results)
+
+    logger.info("\n************\nDataQuality checks on Raw Data Level begins.......")
+
+    # Check for duplicate records
+    preprocessor.drop_duplicates(raw_df, df_name='raw_extracted_dataframe')
+
+    # DataQuality checks on Data Level
+
     # Perform outlier check
-    outlier_results = dataqualitychecker.check_outliers(raw_df, col_to_check_for_outliers)
-    print("\nOutlier Results:\n", outlier_results)
+    outlier_results = qc_results['outliers']
+    logger.info("\nOutlier Results:\n %s", outlier_results)
 
     # Perform missing values check
-    missing_values_results = dataqualitychecker.check_missing_values(raw_df, col_to_check_for_missing_values)
-    print("\nMissing Values Results:\n", missing_values_results)
+    missing_values_results = qc_results['missing_values']
+    logger.info("\nMissing Values Results:\n %s", missing_values_results)
 
     # Perform latitude and longitude check
-    lat_long_results = DataQualityChecker.check_lat_long(raw_df, lat_column, long_column)
+    lat_long_results = qc_results['lat_long']
     if lat_long_results.empty:
-        print("\nLatitude and Longitude columns are consistent.")
+        logger.info("\nLatitude and Longitude columns are consistent.")
     else:
-        print("\nInconsistencies in Latitude and Longitude columns:\n", lat_long_results)
+        logger.info("\nInconsistencies in Latitude and Longitude columns:\n %s", lat_long_results)
 
     # Perform Depth column check
-    depth_check_results = dataqualitychecker.check_depth_columns(raw_df, upper_depth_col, lower_depth_col)
+    depth_check_results = qc_results['depth']
     if depth_check_results.empty:
-        print("\nDepth columns are consistent.")
+        logger.info("\nDepth columns are consistent.")
     else:
-        print("\nInconsistencies in depth columns:\n", depth_check_results)
+        logger.info("\nInconsistencies in depth columns:\n %s", depth_check_results)
 
-    # Step 2- Apply Data Preprocessing
-
-    print('\n**************')
-    print("Data Preprocessing begins here....\n")
-    print(f"Clean data and normalized raw data itself on orgc_method (method string is in dictionary form)")
-
-    new_rows = []
-    for _, row in raw_df.iterrows():
-        new_rows.extend(extract.extract_raw_data_based_on_method_instance(row))
-
-    df_to_preprocessed = preprocessor.append_preprocessed_rows(new_rows)
-
-    print("Removing duplicates after cleaning and normalization based on orgc_method...")
-    df_preprocessed = preprocessor.drop_duplicates(df_to_preprocessed, df_name='preprocessed_dataframe')
-
-    # Reformat dates first
-    print("Reformatting 'orgc_date' to standard format for data consistency...")
     desired_date_format = '%Y-%m-%d'
-    date_column = 'orgc_date_for_instance'
-    df_preprocessed = preprocessor.reformat_dates(df_preprocessed, date_column, desired_date_format)
-
-    # DataQuality checks on reformat date
-    date_format_results = DataQualityChecker.check_date_format(df_preprocessed, ['reformat_orgc_date_for_instance'])
-    if not date_format_results.empty:
-        print('Date Format Results:\n', date_format_results)
+    if args.backend:
+        # Step 2 & 3 - Preprocessing and normalization over partitions on the selected execution backend
+        enter_stage('preprocess')
+        if 'normalize' in profiler.stages:
+            logger.warning("\nWith --backend the normalization is profiled as part of the 'preprocess' stage.")
+        executor = PartitionedExecutor(backend=args.backend, n_partitions=args.partitions,
+                                       partition_column=args.partition_column, max_workers=args.workers,
+                                       scheduler_address=args.scheduler_address)
+        df_normalized_dict, date_format_results, df_preprocessed = executor.run(raw_df, desired_date_format)
+        if not date_format_results.empty:
+            logger.info("Date Format Results:\n %s", date_format_results)
+        else:
+            logger.info("Formatted dates results are consistent in desired format %s.", desired_date_format)
+
+        review_preprocessed_data(extract, df_preprocessed, upper_depth_col, lower_depth_col)
+        stage_timer.record(rows=len(df_preprocessed))
     else:
-        print(f"Formatted dates results are consistent in desired format {desired_date_format}.")
-
-    print("\nAnalyzing the preprocessed dataframe...")
-    review_raw_df = extract.generate_review_dataframes(df_preprocessed)
-    for name, df in review_raw_df.items():
-        print(f"\n{name}:\n", df, "\n" + "-" * 80)
-
-    # Step 3 - Aply Data Transformation and Normalization
-    print("\nData transformation and Normalization step can proceed here...")
-    df_normalized_dict = transformer.normalize_dataframes(df_preprocessed)
-
-    print("\nAnalyzing the 3NF normalized dataframes (orgc_method_df, orgc_profile_df, orgc_profile_layer_df...")
-    df_dict_review = extract.generate_review_dataframes(df_normalized_dict)
-    # Loop through each DataFrame review (since it's a dictionary of dataframes)
-    for df_name, review_data in df_dict_review.items():
-        print(f"\nReview for {df_name}:")
-        for review_name, df in review_data.items():
-            print(f"\n{review_name}:\n", df, "\n" + "-" * 80)
+        # Step 2- Apply Data Preprocessing
+        enter_stage('preprocess')
+
+        logger.info("\n**************")
+        logger.info("Data Preprocessing begins here....\n")
+        logger.info("Clean data and normalized raw data itself on orgc_method (method string is in dictionary form)")
+
+        new_rows = []
+        for _, row in raw_df.iterrows():
+            new_rows.extend(extract.extract_raw_data_based_on_method_instance(row))
+
+        df_to_preprocessed = preprocessor.append_preprocessed_rows(new_rows)
+
+        logger.info("Removing duplicates after cleaning and normalization based on orgc_method...")
+        df_preprocessed = preprocessor.drop_duplicates(df_to_preprocessed, df_name='preprocessed_dataframe')
+
+        # Reformat dates first
+        logger.info("Reformatting 'orgc_date' to standard format for data consistency...")
+        date_column = 'orgc_date_for_instance'
+        df_preprocessed = preprocessor.reformat_dates(df_preprocessed, date_column, desired_date_format)
+
+        # DataQuality checks on reformat date
+        date_format_results = DataQualityChecker.check_date_format(df_preprocessed, ['reformat_orgc_date_for_instance'])
+        if not date_format_results.empty:
+            logger.info("Date Format Results:\n %s", date_format_results)
+        else:
+            logger.info("Formatted dates results are consistent in desired format %s.", desired_date_format)
+
+        review_preprocessed_data(extract, df_preprocessed, upper_depth_col, lower_depth_col)
+        stage_timer.record(rows=len(df_preprocessed))
+
+        # Step 3 - Aply Data Transformation and Normalization
+        enter_stage('normalize')
+        logger.info("\nData transformation and Normalization step can proceed here...")
+        df_normalized_dict = transformer.normalize_dataframes(df_preprocessed)
+
+    stage_timer.record(**{f"{table_name}_rows": len(table_df) for table_name, table_df in df_normalized_dict.items()})
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("\nAnalyzing the 3NF normalized dataframes (orgc_method_df, orgc_profile_df, "
+                     "orgc_profile_layer_df...")
+        df_dict_review = extract.generate_review_dataframes(df_normalized_dict)
+        # Loop through each DataFrame review (since it's a dictionary of dataframes)
+        for df_name, review_data in df_dict_review.items():
+            logger.debug("\nReview for %s:", df_name)
+            for review_name, df in review_data.items():
+                logger.debug("\n%s:\n %s \n%s", review_name, df, '-' * 80)
+
+    # Layer stack consistency: gaps and overlaps between consecutive layers of each profile
+    layer_index = ProfileLayerIndex.from_normalized(df_normalized_dict)
+    layer_gaps = layer_index.find_gaps()
+    layer_overlaps = layer_index.find_overlaps()
+    logger.info("\nLayer stacks: %s profiles, %s depth gaps, %s overlapping layers.",
+                len(layer_index), len(layer_gaps), len(layer_overlaps))
+    if not layer_overlaps.empty:
+        logger.warning("\nOverlapping layers:\n %s", layer_overlaps)
+
+    if args.columnar_dir:
+        ColumnarStore.export_normalized(df_normalized_dict, args.columnar_dir)
 
     # Step 4 - Apply Data Load into SQLite DB 3 NF schema structure
+    enter_stage('load')
     try:
-        sql_script_file_name = 'initialize_db.sql'
-        dataloader.save_to_sqlite(df_normalized_dict, sql_script_file_name, file_name='seqana_soil_data.db')
+        if args.chunk_size:
+            load_committed = dataloader.save_to_sqlite_chunked(df_normalized_dict, sql_script_file_name,
+                                                               file_name=db_file_name, chunk_size=args.chunk_size)
+        else:
+            load_committed = dataloader.save_to_sqlite(df_normalized_dict, sql_script_file_name,
+                                                       file_name=db_file_name)
+
+        stage_timer.record(rows=sum(len(table_df) for table_df in df_normalized_dict.values()),
+                           committed=load_committed)
+
+        # Step 5 - Post-load: depth-harmonized SOC aggregates (0-30, 30-100 cm), only on top of a committed load
+        aggregates_committed = load_committed and dataloader.save_depth_aggregates(file_name=db_file_name)
     except Exception as error:
-        print("Load process stopped.")
+        logger.error("Load process stopped.")
         raise error
 
+    if not aggregates_committed:
+        logger.error("\nLoad or depth aggregates not committed, the run manifest is not recorded.")
+        return False
+
+    # Step 6 - Record the run manifest so unchanged scheduled runs can exit early
+    conn = sqlite3.connect(DataLoading.get_db_file_path(db_file_name))
+    try:
+        RunManifest.record(conn, file_name, source_hash, pipeline_version, config_hash)
+        conn.commit()
+    finally:
+        conn.close()
+    return True
+
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(0 if main() else 1)
@@ -0,0 +1,138 @@
+# src/original_pipeline.py
+
+import logging
+
+import pandas as pd
+
+from src.data_extract.data_extraction import DataExtraction
+from src.data_preprocess_transform.data_preprocessing import DataPreprocessing
+from src.data_preprocess_transform.data_transform_normalize import DataTransformNormalize
+
+logger = logging.getLogger(__name__)
+
+
+class OriginalPipeline:
+    """
+    Frozen copy of the pipeline before the optimized code paths: DataFrame.drop_duplicates instead of row
+    fingerprints, sequential ids instead of hashed natural keys and merges instead of index lookups for the
+    foreign keys. Only used by the regression harness, do not optimize.
+    """
+
+    @staticmethod
+    def drop_duplicates(df, key_columns=None, df_name='DataFrame'):
+        """ Drop duplicate rows based on specified key columns or all columns if not specified. """
+        before_count = len(df)
+        df = df.drop_duplicates(subset=key_columns).reset_index(drop=True)
+        logger.info("\nDuplicates removed from '%s': %s", df_name, before_count - len(df))
+        return df
+
+    @staticmethod
+    def normalize_dataframes(df):
+        """
+        Original normalization with sequential ids and merge-based foreign keys.
+
+        Returns:
+        dict: {'orgc_method_df', 'orgc_profile_df', 'orgc_profile_layer_df'}
+        """
+        # Create orgc_method_df
+        orgc_method_df = pd.concat(
+            df.apply(DataTransformNormalize.transform_data_with_orgc_method_details, axis=1).tolist(),
+            ignore_index=True)
+
+        orgc_method_df = OriginalPipeline.drop_duplicates(orgc_method_df, ['method_instance', 'orgc_method'],
+                                                          "orgc_method_normalized_df")
+
+        # Add 'id' column
+        orgc_method_df['id'] = range(1, len(orgc_method_df) + 1)
+
+        # Rename columns
+        orgc_method_df = orgc_method_df.rename(columns={'sample pretreatment': 'sample_pretreatment'})
+        # Reorder columns to have 'id' as the first column
+        orgc_method_df = orgc_method_df[['id', 'method_instance', 'calculation', 'detection', 'reaction',
+                                         'sample_pretreatment', 'spectral', 'temperature', 'treatment',
+                                         'orgc_method']].reset_index(drop=True)
+        # Convert data types
+        columns_to_str = ['calculation', 'detection', 'reaction', 'sample_pretreatment',
+                          'spectral', 'temperature', 'treatment', 'orgc_method']
+        orgc_method_df[columns_to_str] = orgc_method_df[columns_to_str].astype(str)
+
+        # Create orgc_profile_df
+        orgc_profile_df = df[['profile_id', 'orgc_profile_code', 'orgc_dataset_id', 'X', 'Y', 'country_name']]
+
+        # Rename columns
+        orgc_profile_df = orgc_profile_df.rename(columns={'X': 'longitude', 'Y': 'latitude'})
+
+        # drop duplicate values
+        orgc_profile_df = OriginalPipeline.drop_duplicates(orgc_profile_df, df_name='profile_df')
+
+        # Generate 'id' column for orgc_profile_df
+        orgc_profile_df['id'] = range(1, len(orgc_profile_df) + 1)
+
+        # Convert data types
+        columns_to_str = ['orgc_profile_code']
+        orgc_profile_df[columns_to_str] = orgc_profile_df[columns_to_str].astype(str)
+
+        # Reorder orgc_profile_df
+        orgc_profile_df = orgc_profile_df[['id', 'profile_id', 'orgc_profile_code',
+                                           'orgc_dataset_id', 'latitude', 'longitude',
+                                           'country_name']].reset_index(drop=True)
+
+        # Create orgc_profile_layer_df
+        orgc_profile_layer_df = df[['profile_layer_id', 'upper_depth', 'lower_depth',
+                                    'layer_name', 'litter', 'orgc_value_for_instance', 'orgc_value_avg',
+                                    'reformat_orgc_date_for_instance', 'method_instance', 'orgc_method',
+                                    'profile_id']].reset_index(drop=True)
+
+        # Rename columns
+        orgc_profile_layer_df = orgc_profile_layer_df.rename(columns={'orgc_value_for_instance': 'orgc_value',
+                                                                      'reformat_orgc_date_for_instance': 'orgc_date'})
+
+        # merge orgc_profile_layer_df with orgc_profile_df to get id as orgc_profile_id for (profile_id)
+        orgc_profile_layer_df = orgc_profile_layer_df.merge(orgc_profile_df[['id', 'profile_id']],
+                                                            left_on='profile_id',
+                                                            right_on='profile_id',
+                                                            how='left')
+        orgc_profile_layer_df = orgc_profile_layer_df.rename(columns={'id': 'orgc_profile_id', })
+
+        # merge orgc_profile_layer_df with orgc_method_df to get id as orgc_method_id for (orgc_method, method_instance)
+        orgc_profile_layer_df = orgc_profile_layer_df.merge(orgc_method_df[['id', 'method_instance', 'orgc_method']],
+                                                            left_on=['method_instance', 'orgc_method'],
+                                                            right_on=['method_instance', 'orgc_method'],
+                                                            how='left')
+        orgc_profile_layer_df = orgc_profile_layer_df.rename(columns={'id': 'orgc_method_id', })
+
+        # Add 'id' column for orgc_profile_layer_df
+        orgc_profile_layer_df['id'] = range(1, len(orgc_profile_layer_df) + 1)
+
+        # Convert data types
+        orgc_profile_layer_df['orgc_method_id'] = pd.to_numeric(orgc_profile_layer_df['orgc_method_id'],
+                                                                errors='coerce',
+                                                                downcast='integer')
+
+        # Reorder columns as per SQL schema structure
+        orgc_method_df = orgc_method_df[['id', 'method_instance', 'calculation', 'detection',
+                                         'reaction', 'sample_pretreatment', 'spectral',
+                                         'temperature', 'treatment']].reset_index(drop=True)
+
+        orgc_profile_layer_df = orgc_profile_layer_df[['id', 'profile_layer_id', 'orgc_profile_id',
+                                                       'upper_depth', 'lower_depth', 'layer_name',
+                                                       'litter', 'orgc_method_id', 'orgc_value',
+                                                       'orgc_value_avg', 'orgc_date']].reset_index(drop=True)
+        return {
+            'orgc_method_df': orgc_method_df,
+            'orgc_profile_df': orgc_profile_df,
+            'orgc_profile_layer_df': orgc_profile_layer_df
+        }
+
+    @staticmethod
+    def run(raw_df, desired_date_format='%Y-%m-%d'):
+        """ Original pipeline from raw data to the three normalized tables. """
+        new_rows = []
+        for _, row in raw_df.iterrows():
+            new_rows.extend(DataExtraction.extract_raw_data_based_on_method_instance(row))
+
+        df_preprocessed = DataPreprocessing.append_preprocessed_rows(new_rows)
+        df_preprocessed = OriginalPipeline.drop_duplicates(df_preprocessed, df_name='preprocessed_dataframe')
+        df_preprocessed = DataPreprocessing.reformat_dates(df_preprocessed, 'orgc_date_for_instance',
+                                                           desired_date_format)
+        return OriginalPipeline.normalize_dataframes(df_preprocessed)
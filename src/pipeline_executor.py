@@ -0,0 +1,223 @@
+# src/pipeline_executor.py
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from src.data_extract.data_extraction import DataExtraction
+from src.data_preprocess_transform.data_preprocessing import DataPreprocessing
+from src.data_preprocess_transform.data_quality_checker import DataQualityChecker
+from src.data_preprocess_transform.data_transform_normalize import DataTransformNormalize
+
+logger = logging.getLogger(__name__)
+
+SOURCE_ROW_COLUMN = '_source_row'
+TABLE_NAMES = ('orgc_method_df', 'orgc_profile_df', 'orgc_profile_layer_df')
+PREPROCESSED_NAME = 'preprocessed'
+
+
+def process_partition(raw_partition, desired_date_format='%Y-%m-%d'):
+    """
+    Run the per-row pipeline stages on one partition of the raw data: method explode, duplicate removal,
+    date reformatting, date format check and normalization.
+
+    The raw rows must carry their global position in SOURCE_ROW_COLUMN. It is used to compute, for every row of
+    the partition's normalized tables, the key that restores the single-process row order after the merge.
+
+    Returns:
+    dict: {table_name: DataFrame} with an extra SOURCE_ROW_COLUMN order key (and 'instance_rank' for methods),
+          plus 'date_format_issues' and the preprocessed rows under PREPROCESSED_NAME (with SOURCE_ROW_COLUMN).
+    """
+    new_rows = []
+    for _, row in raw_partition.iterrows():
+        new_rows.extend(DataExtraction.extract_raw_data_based_on_method_instance(row))
+    df_to_preprocessed = DataPreprocessing.append_preprocessed_rows(new_rows)
+
+    key_columns = [column for column in df_to_preprocessed.columns if column != SOURCE_ROW_COLUMN]
+    df_preprocessed = DataPreprocessing.drop_duplicates(df_to_preprocessed, key_columns,
+                                                        df_name='preprocessed_dataframe')
+    df_preprocessed = DataPreprocessing.reformat_dates(df_preprocessed, 'orgc_date_for_instance', desired_date_format)
+    date_format_issues = DataQualityChecker.check_date_format(df_preprocessed, ['reformat_orgc_date_for_instance'],
+                                                              desired_date_format)
+
+    df_normalized_dict = DataTransformNormalize.normalize_dataframes(df_preprocessed)
+    source_rows = df_preprocessed[SOURCE_ROW_COLUMN].to_numpy()
+
+    # Layers are built 1:1 from the preprocessed rows, in order
+    df_normalized_dict['orgc_profile_layer_df'][SOURCE_ROW_COLUMN] = source_rows
+
+    # Profiles appear at the first preprocessed row of their profile_id
+    first_row_by_profile = df_preprocessed.groupby('profile_id', sort=False)[SOURCE_ROW_COLUMN].min()
+    orgc_profile_df = df_normalized_dict['orgc_profile_df']
+    orgc_profile_df[SOURCE_ROW_COLUMN] = first_row_by_profile.reindex(orgc_profile_df['profile_id']).to_numpy()
+
+    # Methods appear at the first preprocessed row of their orgc_method string, in the string's instance order
+    first_row_by_method = df_preprocessed.groupby('orgc_method', sort=False)[SOURCE_ROW_COLUMN].min()
+    method_order_frames = []
+    for method_str, first_row in first_row_by_method.items():
+        method_details = DataTransformNormalize.transform_data_with_orgc_method_details(
+            pd.Series({'orgc_method': method_str}))
+        method_order_frames.append(pd.DataFrame({
+            'id': DataTransformNormalize.hash_natural_keys(method_details, DataTransformNormalize.METHOD_NATURAL_KEY),
+            SOURCE_ROW_COLUMN: first_row,
+            'instance_rank': range(len(method_details)),
+        }))
+    orgc_method_df = df_normalized_dict['orgc_method_df']
+    if method_order_frames:
+        method_order = pd.concat(method_order_frames, ignore_index=True).drop_duplicates('id').set_index('id')
+        orgc_method_df[SOURCE_ROW_COLUMN] = method_order[SOURCE_ROW_COLUMN].reindex(orgc_method_df['id']).to_numpy()
+        orgc_method_df['instance_rank'] = method_order['instance_rank'].reindex(orgc_method_df['id']).to_numpy()
+    else:
+        orgc_method_df[SOURCE_ROW_COLUMN] = []
+        orgc_method_df['instance_rank'] = []
+
+    df_normalized_dict['date_format_issues'] = date_format_issues
+    df_normalized_dict[PREPROCESSED_NAME] = df_preprocessed
+    return df_normalized_dict
+
+
+class PartitionedExecutor:
+    """
+    Runs the row-level pipeline stages over partitions of the raw data on a pluggable backend and merges the
+    dimension tables centrally.
+
+    Backends:
+    - 'local': partitions run one after another in this process (reference and tests).
+    - 'processes': a local process pool.
+    - 'dask': a dask.distributed cluster at `scheduler_address`, or an in-process LocalCluster if none is given.
+    - 'ray': a Ray cluster at `scheduler_address`, or a local Ray instance if none is given.
+
+    Surrogate ids are hashes of natural keys (see DataTransformNormalize.generate_stable_ids), so partitions
+    generate them independently. The merged tables are identical to the single-process run, row order included.
+    """
+
+    BACKENDS = ('local', 'processes', 'dask', 'ray')
+    PARTITION_COLUMNS = ('profile_id', 'country_name')
+
+    def __init__(self, backend='local', n_partitions=4, partition_column='profile_id', max_workers=None,
+                 scheduler_address=None):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown execution backend '{backend}'. Expected one of {self.BACKENDS}.")
+        if partition_column not in self.PARTITION_COLUMNS:
+            raise ValueError(f"Cannot partition on '{partition_column}'. Expected one of {self.PARTITION_COLUMNS}.")
+        if n_partitions < 1:
+            raise ValueError("n_partitions must be at least 1.")
+
+        self.backend = backend
+        self.n_partitions = n_partitions
+        self.partition_column = partition_column
+        self.max_workers = max_workers
+        self.scheduler_address = scheduler_address
+
+    def partition_raw_data(self, raw_df):
+        """
+        Split the raw data into at most n_partitions frames by hashing the partition column. All rows of a
+        profile (or country) land in the same partition, and every row keeps its global position.
+        """
+        raw_df = raw_df.reset_index(drop=True)
+        raw_df = raw_df.assign(**{SOURCE_ROW_COLUMN: range(len(raw_df))})
+
+        partition_codes = pd.util.hash_pandas_object(raw_df[self.partition_column], index=False) % self.n_partitions
+        return [partition for _, partition in raw_df.groupby(partition_codes.to_numpy(), sort=True)]
+
+    def _map(self, partitions, desired_date_format):
+        date_formats = [desired_date_format] * len(partitions)
+
+        if self.backend == 'local':
+            return [process_partition(partition, desired_date_format) for partition in partitions]
+
+        if self.backend == 'processes':
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                return list(pool.map(process_partition, partitions, date_formats))
+
+        if self.backend == 'dask':
+            try:
+                from dask.distributed import Client, LocalCluster
+            except ImportError as error:
+                raise ImportError("The 'dask' backend needs dask.distributed: pip install 'dask[distributed]'") \
+                    from error
+
+            cluster = None
+            if self.scheduler_address:
+                client = Client(self.scheduler_address)
+            else:
+                cluster = LocalCluster(processes=False, n_workers=1, threads_per_worker=self.max_workers or 1)
+                client = Client(cluster)
+            try:
+                return client.gather(client.map(process_partition, partitions, date_formats))
+            finally:
+                client.close()
+                if cluster is not None:
+                    cluster.close()
+
+        try:
+            import ray
+        except ImportError as error:
+            raise ImportError("The 'ray' backend needs ray: pip install ray") from error
+
+        started_here = not ray.is_initialized()
+        if started_here:
+            ray.init(address=self.scheduler_address, num_cpus=self.max_workers)
+        try:
+            remote_process_partition = ray.remote(process_partition)
+            return ray.get([remote_process_partition.remote(partition, desired_date_format)
+                            for partition in partitions])
+        finally:
+            if started_here:
+                ray.shutdown()
+
+    @staticmethod
+    def merge_partition_results(results):
+        """
+        Merge the per-partition tables: restore the single-process row order and keep the first occurrence of
+        every dimension row (methods can be shared between partitions). The preprocessed rows are merged in
+        source row order as well.
+        """
+        merged = {}
+        for table_name in TABLE_NAMES:
+            frames = [result[table_name] for result in results]
+            table_df = pd.concat(frames, ignore_index=True)
+            order_columns = [SOURCE_ROW_COLUMN] + (['instance_rank'] if table_name == 'orgc_method_df' else [])
+
+            table_df = table_df.sort_values(order_columns, kind='mergesort')
+            if table_name != 'orgc_profile_layer_df':
+                table_df = table_df.drop_duplicates('id')
+            elif table_df['id'].duplicated().any():
+                raise ValueError("\nThe same layer id was produced by several partitions.")
+
+            merged[table_name] = table_df.drop(columns=order_columns).reset_index(drop=True)
+
+        if merged['orgc_profile_df']['profile_id'].duplicated().any():
+            raise ValueError("\nA profile was split across partitions with different attributes.")
+
+        date_format_issues = [result['date_format_issues'] for result in results
+                              if not result['date_format_issues'].empty]
+        merged['date_format_issues'] = pd.concat(date_format_issues, ignore_index=True) \
+            if date_format_issues else pd.DataFrame()
+
+        # Stable sort: the exploded method instances of a raw row keep their order
+        preprocessed = pd.concat([result[PREPROCESSED_NAME] for result in results], ignore_index=True)
+        merged[PREPROCESSED_NAME] = preprocessed.sort_values(SOURCE_ROW_COLUMN, kind='mergesort') \
+            .drop(columns=[SOURCE_ROW_COLUMN]).reset_index(drop=True)
+        return merged
+
+    def run(self, raw_df, desired_date_format='%Y-%m-%d'):
+        """
+        Explode, deduplicate, reformat dates and normalize the raw data over partitions on the configured backend.
+
+        Returns:
+        tuple: ({'orgc_method_df', 'orgc_profile_df', 'orgc_profile_layer_df'}, date format issues DataFrame,
+                preprocessed DataFrame in single-process row order)
+        """
+        partitions = self.partition_raw_data(raw_df)
+        logger.info("\nRunning %s partition(s) by '%s' on the '%s' backend...",
+                    len(partitions), self.partition_column, self.backend)
+
+        merged = self.merge_partition_results(self._map(partitions, desired_date_format))
+        date_format_issues = merged.pop('date_format_issues')
+        df_preprocessed = merged.pop(PREPROCESSED_NAME)
+
+        for table_name, table_df in merged.items():
+            logger.info("Merged '%s': %s rows.", table_name, len(table_df), extra={'table': table_name, 'rows': len(table_df)})
+        return merged, date_format_issues, df_preprocessed
@@ -0,0 +1,264 @@
+# src/pipeline_profiler.py
+
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+
+class StackSampler:
+    """
+    Low-overhead sampling profiler: a background thread records the call stack of every other thread (e.g. the
+    quality check pool) every `interval` seconds. Stacks are rooted at a 'thread <name>' frame.
+    Needs sys._current_frames (CPython).
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._thread_names = {}
+
+    @staticmethod
+    def is_available():
+        return hasattr(sys, '_current_frames')
+
+    @staticmethod
+    def _frame_label(code):
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _thread_label(self, thread_id):
+        if thread_id not in self._thread_names:
+            self._thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        return f"thread {self._thread_names.get(thread_id, thread_id)}"
+
+    def _run(self):
+        sampler_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_label(frame.f_code))
+                    frame = frame.f_back
+                if stack:
+                    stack.append(self._thread_label(thread_id))
+                    self.samples[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+
+    def write_collapsed(self, path):
+        """ Write 'frame;frame;frame count' lines, the input format of flamegraph.pl / speedscope. """
+        with open(path, 'w') as file:
+            for stack, count in self.samples.most_common():
+                file.write(f"{stack} {count}\n")
+
+    def top_functions(self, top_n):
+        """ Hottest functions by self samples, with their inclusive sample counts. """
+        self_samples = Counter()
+        total_samples = Counter()
+        for stack, count in self.samples.items():
+            frames = stack.split(';')[1:]
+            self_samples[frames[-1]] += count
+            for frame in set(frames):
+                total_samples[frame] += count
+        sample_count = sum(self.samples.values()) or 1
+        return [{
+            'function': function,
+            'self_pct': round(100 * count / sample_count, 2),
+            'total_pct': round(100 * total_samples[function] / sample_count, 2),
+            'self_samples': count,
+        } for function, count in self_samples.most_common(top_n)]
+
+
+class PipelineProfiler:
+    """
+    Optional profiling of pipeline stages with cProfile or the sampling profiler.
+
+    Stages are marked with enter_stage(name); entering a stage closes the previous one. Only the stages selected
+    at construction are profiled. Selecting 'run' profiles the whole run as a single stage. For every profiled
+    stage the profiler writes to `output_dir`:
+    - <stage>.pstats (cProfile mode), readable with pstats / snakeviz. Threads started while a stage is profiled
+      (e.g. the quality check pool) get their own profiler, merged into the stage's statistics,
+    - <stage>.collapsed, flamegraph-ready collapsed stacks. In cProfile mode these are caller;callee edges
+      weighted by own time in microseconds, in sampling mode full stacks weighted by sample count,
+    and a top-N hot-function summary per stage into profile_report.txt.
+    """
+
+    STAGES = ('run', 'extract', 'quality_checks', 'preprocess', 'normalize', 'load')
+    MODES = ('cprofile', 'sampling')
+
+    def __init__(self, stages=None, mode='cprofile', output_dir='profiles', top_n=15, sample_interval=0.005):
+        """
+        Parameters:
+        stages (list of str, optional): Stages to profile, see STAGES. 'all' selects every stage except 'run'.
+                                        None or empty disables profiling.
+        mode (str): 'cprofile' (deterministic) or 'sampling' (low overhead, statistical).
+        output_dir (str): Directory for .pstats, .collapsed and the report.
+        top_n (int): Number of hot functions per stage in the report.
+        sample_interval (float): Seconds between two samples in sampling mode.
+        """
+        stages = list(stages or [])
+        if 'all' in stages:
+            stages = [stage for stage in self.STAGES if stage != 'run']
+        unknown = set(stages) - set(self.STAGES)
+        if unknown:
+            raise ValueError(f"Unknown profiling stage(s): {sorted(unknown)}. Expected any of {self.STAGES}.")
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown profiling mode '{mode}'. Expected one of {self.MODES}.")
+        if mode == 'sampling' and not StackSampler.is_available():
+            logger.warning("Sampling profiler not available on this interpreter, falling back to cProfile.")
+            mode = 'cprofile'
+
+        self.stages = stages
+        self.mode = mode
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.sample_interval = sample_interval
+
+        self.results = {}
+        self._active_stage = None
+        self._active_profiler = None
+        self._thread_profilers = []
+        self._started_at = None
+
+    @property
+    def enabled(self):
+        return bool(self.stages)
+
+    def _profile_new_thread(self, frame, event, arg):
+        # threading.setprofile hook, called once in every thread started during the stage: hand the thread over
+        # to its own cProfile profiler (cProfile only sees the thread that enabled it)
+        thread_profiler = cProfile.Profile()
+        self._thread_profilers.append(thread_profiler)
+        thread_profiler.enable()
+
+    def _start(self, stage):
+        if self.mode == 'cprofile':
+            profiler = cProfile.Profile()
+            self._thread_profilers = []
+            threading.setprofile(self._profile_new_thread)
+            profiler.enable()
+        else:
+            profiler = StackSampler(self.sample_interval)
+            profiler.start()
+        self._active_stage = stage
+        self._active_profiler = profiler
+        self._started_at = time.perf_counter()
+
+    def _stop(self):
+        stage, profiler = self._active_stage, self._active_profiler
+        duration = time.perf_counter() - self._started_at
+        self._active_stage = None
+        self._active_profiler = None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        collapsed_path = os.path.join(self.output_dir, f"{stage}.collapsed")
+
+        if self.mode == 'cprofile':
+            profiler.disable()
+            threading.setprofile(None)
+            stats = pstats.Stats(profiler)
+            for thread_profiler in self._thread_profilers:
+                stats.add(thread_profiler)
+            self._thread_profilers = []
+            pstats_path = os.path.join(self.output_dir, f"{stage}.pstats")
+            stats.dump_stats(pstats_path)
+            self._write_cprofile_collapsed(stats, collapsed_path)
+            top_functions = self._cprofile_top_functions(stats)
+        else:
+            profiler.stop()
+            pstats_path = None
+            profiler.write_collapsed(collapsed_path)
+            top_functions = profiler.top_functions(self.top_n)
+
+        self.results[stage] = {
+            'duration_s': round(duration, 3),
+            'pstats': pstats_path,
+            'collapsed': collapsed_path,
+            'top_functions': top_functions,
+        }
+
+    def enter_stage(self, stage):
+        """ Mark the start of a stage. Closes the previously profiled stage unless the whole run is profiled. """
+        if self._active_stage == 'run':
+            return
+        if self._active_stage is not None:
+            self._stop()
+        if stage in self.stages:
+            self._start(stage)
+
+    def finish(self):
+        """ Close the active stage and write the report. Returns the report text ('' when nothing was profiled). """
+        if self._active_stage is not None:
+            self._stop()
+        if not self.results:
+            return ''
+
+        report = self.format_report()
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(os.path.join(self.output_dir, 'profile_report.txt'), 'w') as file:
+            file.write(report)
+        logger.info("%s", report)
+        return report
+
+    @staticmethod
+    def _function_label(function):
+        file_name, line_number, function_name = function
+        if file_name == '~':
+            return function_name
+        return f"{function_name} ({os.path.basename(file_name)}:{line_number})"
+
+    def _cprofile_top_functions(self, stats):
+        rows = []
+        for function, (_, call_count, own_time, cumulative_time, _) in stats.stats.items():
+            rows.append({
+                'function': self._function_label(function),
+                'calls': call_count,
+                'own_s': round(own_time, 4),
+                'cumulative_s': round(cumulative_time, 4),
+            })
+        rows.sort(key=lambda row: row['own_s'], reverse=True)
+        return rows[:self.top_n]
+
+    def _write_cprofile_collapsed(self, stats, path):
+        with open(path, 'w') as file:
+            for function, (_, _, own_time, _, callers) in stats.stats.items():
+                label = self._function_label(function)
+                if not callers:
+                    weight = int(own_time * 1e6)
+                    if weight:
+                        file.write(f"{label} {weight}\n")
+                    continue
+                for caller, caller_stats in callers.items():
+                    weight = int(caller_stats[2] * 1e6)
+                    if weight:
+                        file.write(f"{self._function_label(caller)};{label} {weight}\n")
+
+    def format_report(self):
+        lines = [f"\n************\nProfiling report ({self.mode})"]
+        for stage, result in self.results.items():
+            lines.append(f"\nStage '{stage}': {result['duration_s']} s")
+            if result['pstats']:
+                lines.append(f"  pstats:    {result['pstats']}")
+            lines.append(f"  collapsed: {result['collapsed']}")
+            lines.append(f"  Top {self.top_n} functions:")
+            for row in result['top_functions']:
+                details = ', '.join(f"{key}={value}" for key, value in row.items() if key != 'function')
+                lines.append(f"    {row['function']}: {details}")
+        return '\n'.join(lines) + '\n'
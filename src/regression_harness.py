@@ -0,0 +1,506 @@
+# src/regression_harness.py
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from src.data_extract.data_extraction import DataExtraction
+from src.data_preprocess_transform.data_preprocessing import DataPreprocessing
+from src.data_preprocess_transform.data_transform_normalize import DataTransformNormalize
+from src.data_load.data_loading import DataLoading
+from src.data_load.run_manifest import RunManifest
+from src.original_pipeline import OriginalPipeline
+from src.pipeline_executor import PartitionedExecutor
+from src.pipeline_logging import LOG_LEVELS, configure_logging
+
+logger = logging.getLogger(__name__)
+
+SOURCE_FILE_NAME = 'seqana-data-engineering-challenge-data-wosis-belgium.xlsx'
+SQL_SCRIPT_FILE_NAME = 'initialize_db.sql'
+SQLITE_TABLES = ('orgc_method', 'orgc_profile', 'orgc_profile_layer', DataLoading.AGGREGATE_TABLE)
+DEFAULT_GOLDEN_DIR = os.path.join('golden', 'belgium')
+SNAPSHOT_FILE_NAME = 'snapshot.json'
+# Surrogate foreign key columns and the table holding the referenced ids
+SURROGATE_FOREIGN_KEYS = {'orgc_profile_id': 'orgc_profile', 'orgc_method_id': 'orgc_method'}
+
+
+class RegressionHarness:
+    """
+    Golden-output regression harness for the pipeline.
+
+    The reference is today's single-pass implementation: extract_raw_data_based_on_method_instance,
+    drop_duplicates, reformat_dates, normalize_dataframes and save_to_sqlite. Its normalized tables and SQLite
+    contents are snapshotted, and every alternative engine (partitioned backends, chunked load, or any future
+    vectorized or streaming path) is diffed against them. Comparisons are order-insensitive: both frames are
+    canonicalized (typed, column-sorted) and sorted by all columns before assert_frame_equal.
+
+    The Belgium snapshot lives in golden/belgium and catches changes of the reference functions themselves.
+    Synthetic data is generated from a seed and compared reference-vs-engine on every run.
+
+    The original implementation (OriginalPipeline: DataFrame.drop_duplicates, sequential ids, merged foreign
+    keys) is compared with the reference as well. Its ids differ by design, so that comparison replaces every
+    surrogate id by the natural key it stands for (without_surrogate_ids).
+    """
+
+    @staticmethod
+    def run_reference_pipeline(raw_df, desired_date_format='%Y-%m-%d'):
+        """
+        Today's single-process pipeline from raw data to the three normalized tables (main.py without the
+        quality checks, which do not change the data).
+
+        Returns:
+        dict: {'orgc_method_df', 'orgc_profile_df', 'orgc_profile_layer_df'}
+        """
+        new_rows = []
+        for _, row in raw_df.iterrows():
+            new_rows.extend(DataExtraction.extract_raw_data_based_on_method_instance(row))
+
+        df_preprocessed = DataPreprocessing.append_preprocessed_rows(new_rows)
+        df_preprocessed = DataPreprocessing.drop_duplicates(df_preprocessed, df_name='preprocessed_dataframe')
+        df_preprocessed = DataPreprocessing.reformat_dates(df_preprocessed, 'orgc_date_for_instance',
+                                                           desired_date_format)
+        return DataTransformNormalize.normalize_dataframes(df_preprocessed)
+
+    @staticmethod
+    def load_reference(tables, db_path, sql_script_name=SQL_SCRIPT_FILE_NAME):
+        """ Reference load: save_to_sqlite plus the depth aggregates, on a copy of the tables. """
+        DataLoading.save_to_sqlite({name: df.copy() for name, df in tables.items()}, sql_script_name,
+                                   file_name=db_path)
+        DataLoading.save_depth_aggregates(file_name=db_path)
+
+    @staticmethod
+    def read_sqlite_tables(db_path, table_names=SQLITE_TABLES):
+        """ The content of the given tables as DataFrames. """
+        conn = sqlite3.connect(db_path)
+        try:
+            return {table_name: pd.read_sql_query(f"SELECT * FROM {table_name}", conn) for table_name in table_names}
+        finally:
+            conn.close()
+
+    @staticmethod
+    def canonicalize_frame(df):
+        """
+        Bring a frame into a comparable form independent of row order, column order and storage types:
+        integer-valued numbers become Int64, other numbers float64, everything else str (missing becomes None).
+        Rows are sorted by all columns ('id' first when present).
+        """
+        columns = sorted(df.columns, key=lambda column: (column != 'id', column))
+        canonical = {}
+        for column in columns:
+            series = df[column]
+            if pd.api.types.is_bool_dtype(series):
+                series = series.astype('Int64')
+            if pd.api.types.is_integer_dtype(series):
+                canonical[column] = series.astype('Int64')
+            elif pd.api.types.is_float_dtype(series):
+                values = series.dropna()
+                is_whole = values.empty or (np.isfinite(values).all() and (values % 1 == 0).all()
+                                            and values.abs().max() < 2 ** 53)
+                canonical[column] = series.astype('Int64') if is_whole and not values.empty else series
+            else:
+                canonical[column] = series.map(lambda value: None if pd.isna(value) else str(value)).astype(object)
+
+        canonical_df = pd.DataFrame(canonical, index=range(len(df)))
+        if not columns:
+            return canonical_df
+        return canonical_df.sort_values(columns, kind='mergesort', na_position='last').reset_index(drop=True)
+
+    @staticmethod
+    def compare_frames(expected, actual, rtol=1e-9):
+        """
+        Order-insensitive comparison of two frames.
+
+        Returns:
+        str or None: Description of the first difference, None when the frames are equivalent.
+        """
+        if set(expected.columns) != set(actual.columns):
+            missing = sorted(set(expected.columns) - set(actual.columns))
+            extra = sorted(set(actual.columns) - set(expected.columns))
+            return f"column mismatch: missing {missing}, unexpected {extra}"
+        if len(expected) != len(actual):
+            return f"row count {len(actual)} instead of {len(expected)}"
+
+        try:
+            pd.testing.assert_frame_equal(RegressionHarness.canonicalize_frame(expected),
+                                          RegressionHarness.canonicalize_frame(actual),
+                                          check_dtype=False, check_exact=False, rtol=rtol)
+        except AssertionError as error:
+            return ' '.join(str(error).split())
+        return None
+
+    @staticmethod
+    def without_surrogate_ids(tables):
+        """
+        Id-insensitive form of normalized or SQLite tables: the 'id' columns are dropped and every surrogate
+        foreign key (SURROGATE_FOREIGN_KEYS) is replaced by the referenced row's values, joined into one string.
+        Tables may be named with or without the '_df' suffix.
+
+        Returns:
+        dict: {table_name: DataFrame}
+        """
+        def parent_keys(parent_name):
+            parent_df = tables.get(parent_name, tables.get(f"{parent_name}_df"))
+            if parent_df is None:
+                return None
+            canonical = RegressionHarness.canonicalize_frame(parent_df)
+            keys = canonical.drop(columns='id').apply(lambda row: '|'.join(str(value) for value in row), axis=1)
+            return pd.Series(keys.to_numpy(), index=canonical['id'].astype('int64'))
+
+        natural_keys = {column: parent_keys(parent_name) for column, parent_name in SURROGATE_FOREIGN_KEYS.items()}
+        id_free_tables = {}
+        for table_name, df in tables.items():
+            df = df.drop(columns=[column for column in ('id',) if column in df.columns])
+            for column, keys in natural_keys.items():
+                if column in df.columns and keys is not None:
+                    df = df.assign(**{column: df[column].map(keys)})
+            id_free_tables[table_name] = df
+        return id_free_tables
+
+    @staticmethod
+    def compare_tables(expected_tables, actual_tables, dataset, engine):
+        """
+        Compare every expected table with the engine's table of the same name.
+
+        Returns:
+        list of dict: One result row per table with 'dataset', 'engine', 'table', 'status' and 'detail'.
+        """
+        rows = []
+        for table_name, expected_df in expected_tables.items():
+            if table_name not in actual_tables:
+                difference = "table missing"
+            else:
+                difference = RegressionHarness.compare_frames(expected_df, actual_tables[table_name])
+            rows.append({
+                'dataset': dataset,
+                'engine': engine,
+                'table': table_name,
+                'status': 'mismatch' if difference else 'match',
+                'detail': difference or f"{len(expected_df)} rows",
+            })
+        return rows
+
+    @staticmethod
+    def write_snapshot(directory, snapshot, metadata=None):
+        """
+        Store a golden snapshot: one gzipped CSV per table under <directory>/<group>/ and snapshot.json with
+        the row counts and dtypes needed to read the tables back.
+
+        Parameters:
+        directory (str): Snapshot directory.
+        snapshot (dict): {group: {table_name: DataFrame}}, e.g. groups 'normalized' and 'sqlite'.
+        metadata (dict, optional): Extra information stored in snapshot.json (source hash etc.).
+        """
+        manifest = {'metadata': metadata or {}, 'pandas_version': pd.__version__, 'tables': {}}
+        for group, tables in snapshot.items():
+            os.makedirs(os.path.join(directory, group), exist_ok=True)
+            for table_name, df in tables.items():
+                relative_path = f"{group}/{table_name}.csv.gz"
+                df.to_csv(os.path.join(directory, relative_path), index=False,
+                          compression={'method': 'gzip', 'mtime': 0})
+                manifest['tables'][relative_path] = {
+                    'group': group,
+                    'table': table_name,
+                    'row_count': len(df),
+                    'dtypes': {column: str(dtype) for column, dtype in df.dtypes.items()},
+                }
+
+        with open(os.path.join(directory, SNAPSHOT_FILE_NAME), 'w') as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+        logger.info("\nGolden snapshot written to '%s' (%s tables).", directory, len(manifest['tables']))
+        return manifest
+
+    @staticmethod
+    def same_pandas_release(version):
+        """ True when version has the same major.minor release as the installed pandas. """
+        return version is not None and version.split('.')[:2] == pd.__version__.split('.')[:2]
+
+    @staticmethod
+    def read_snapshot(directory):
+        """
+        Read a golden snapshot written by write_snapshot.
+
+        Returns:
+        tuple: ({group: {table_name: DataFrame}}, manifest dict)
+        """
+        with open(os.path.join(directory, SNAPSHOT_FILE_NAME)) as file:
+            manifest = json.load(file)
+
+        snapshot = {}
+        for relative_path, table_info in manifest['tables'].items():
+            text_columns = [column for column, dtype in table_info['dtypes'].items() if dtype in ('object', 'str')]
+            # Only empty cells are missing: to_csv writes NaN as '', while text such as 'nan' or 'NA' is data
+            df = pd.read_csv(os.path.join(directory, relative_path), dtype={column: str for column in text_columns},
+                             keep_default_na=False, na_values=[''])
+            snapshot.setdefault(table_info['group'], {})[table_info['table']] = df
+        return snapshot, manifest
+
+    @staticmethod
+    def synthetic_raw_data(n_profiles=60, seed=0):
+        """
+        Deterministic raw data in the layout of the WoSIS workbook, covering the cases the reference handles
+        specially: several method instances per layer, missing values, repeated dates between instances, exact
+        duplicate rows, unpadded dates, mixed int/str profile codes, layer gaps and optional method attributes.
+        """
+        rng = np.random.default_rng(seed)
+        method_attributes = {
+            'calculation': ['not specified', 'default correction factor for recovery of 1.3 - assumed'],
+            'detection': ['not specified', 'titrimetric', 'colorimetric'],
+            'reaction': ['not specified', 'wet oxidation with Sulphuric acid [H2SO4]', 'dry combustion'],
+            'sample pretreatment': ['sieved over 2 mm sieve', 'not specified'],
+            'temperature': ['not specified', 'no external heat', 'at 1000 degrees'],
+            'treatment': ['not specified', 'acid pretreatment'],
+        }
+        datasets = ['BE-UplandsI', 'WD-WISE', 'WD-ISIS', 'EU-SPADE']
+
+        def method_description():
+            parts = [f"{name} = {rng.choice(values)}" for name, values in method_attributes.items()]
+            if rng.random() < 0.5:
+                parts.insert(4, f"spectral = {rng.choice(['false', 'true'])}")
+            return ', '.join(parts)
+
+        rows = []
+        profile_layer_id = 500000
+        for profile_number in range(n_profiles):
+            profile_id = 900000 + profile_number
+            longitude, latitude = rng.uniform(2.5, 6.4), rng.uniform(49.5, 51.5)
+            profile_code = f"SY{profile_number:03d}" if profile_number % 2 else int(1e12 + profile_number)
+            dataset_id = datasets[profile_number % len(datasets)]
+            descriptions = [method_description() for _ in range(int(rng.integers(1, 4)))]
+
+            upper_depth = 0
+            for _ in range(int(rng.integers(1, 7))):
+                thickness = int(rng.integers(3, 40))
+                lower_depth = upper_depth + thickness
+                instance_count = len(descriptions)
+                values = [f"{rng.uniform(0.1, 60):.2f}" for _ in range(instance_count)]
+                year, month, day = int(rng.integers(1960, 2020)), int(rng.integers(1, 13)), int(rng.integers(1, 29))
+                # Later instances repeat the first date or carry a zero-padded other date
+                dates = [f"{year}-{month}-{day}" if instance == 0 or rng.random() < 0.5
+                         else f"{year}-{month:02d}-{day + instance:02d}" for instance in range(instance_count)]
+                missing_value = rng.random() < 0.05
+
+                rows.append({
+                    'X': longitude,
+                    'Y': latitude,
+                    'profile_id': profile_id,
+                    'profile_layer_id': profile_layer_id,
+                    'country_name': 'Belgium',
+                    'upper_depth': upper_depth,
+                    'lower_depth': lower_depth,
+                    'layer_name': rng.choice(['Ap', 'Bt1', 'C1']) if rng.random() < 0.3 else np.nan,
+                    'litter': np.nan,
+                    'orgc_value': np.nan if missing_value else
+                    '{' + ','.join(f"{instance + 1}:{value}" for instance, value in enumerate(values)) + '}',
+                    'orgc_value_avg': np.nan if missing_value else round(float(np.mean([float(v) for v in values])), 2),
+                    'orgc_method': '{' + ','.join(f'"{instance + 1}:{description}"'
+                                                  for instance, description in enumerate(descriptions)) + '}',
+                    'orgc_date': '{' + ','.join(f"{instance + 1}:{date}" for instance, date in enumerate(dates)) + '}',
+                    'orgc_dataset_id': dataset_id,
+                    'orgc_profile_code': profile_code,
+                })
+                profile_layer_id += 1
+                # Occasional gap below the layer
+                upper_depth = lower_depth + (int(rng.integers(1, 10)) if rng.random() < 0.1 else 0)
+
+        raw_df = pd.DataFrame(rows)
+        # A few exact duplicate rows, as delivered in real extracts
+        duplicates = raw_df.sample(n=max(1, len(raw_df) // 50), random_state=seed)
+        return pd.concat([raw_df, duplicates], ignore_index=True)
+
+    @staticmethod
+    def partitioned_engine(backend, n_partitions=4, partition_column='profile_id'):
+        """ Normalize engine running the PartitionedExecutor on the given backend. """
+        def engine(raw_df):
+            executor = PartitionedExecutor(backend=backend, n_partitions=n_partitions,
+                                           partition_column=partition_column)
+            return executor.run(raw_df)[0]
+        return engine
+
+    @staticmethod
+    def chunked_load_engine(chunk_size):
+        """ Load engine using the resumable chunked loader. """
+        def engine(tables, db_path, sql_script_name=SQL_SCRIPT_FILE_NAME):
+            DataLoading.save_to_sqlite_chunked({name: df.copy() for name, df in tables.items()}, sql_script_name,
+                                               file_name=db_path, chunk_size=chunk_size)
+            DataLoading.save_depth_aggregates(file_name=db_path)
+        return engine
+
+    @staticmethod
+    def run(raw_df, dataset, normalize_engines, load_engines, golden_dir=None, update_golden=False,
+            metadata=None, original_engines=None):
+        """
+        Run the reference on raw_df and diff every engine against it.
+
+        Parameters:
+        raw_df (pd.DataFrame): Raw data in the workbook layout.
+        dataset (str): Name of the data set in the report.
+        normalize_engines (dict): {name: callable(raw_df) -> normalized tables}. The engine output is compared
+                                  with the reference tables, then loaded and compared with the reference database.
+        load_engines (dict): {name: callable(tables, db_path)}. Loads the reference tables, compared with the
+                             reference database.
+        golden_dir (str, optional): Compare the reference itself with the golden snapshot in this directory.
+        update_golden (bool): Write the reference output as the new golden snapshot instead of comparing.
+        metadata (dict, optional): Stored with an updated snapshot.
+        original_engines (dict, optional): {name: callable(raw_df) -> normalized tables} with their own ids, e.g.
+                                           OriginalPipeline.run. Compared like normalize_engines, but on
+                                           without_surrogate_ids of both sides.
+
+        Returns:
+        pd.DataFrame: One row per (engine, table) with the status 'match', 'mismatch' or 'skipped'.
+        """
+        results = []
+        with tempfile.TemporaryDirectory() as work_dir:
+            reference_tables = RegressionHarness.run_reference_pipeline(raw_df)
+            reference_db_path = os.path.join(work_dir, 'reference.db')
+            RegressionHarness.load_reference(reference_tables, reference_db_path)
+            reference_db_tables = RegressionHarness.read_sqlite_tables(reference_db_path)
+
+            if golden_dir and update_golden:
+                RegressionHarness.write_snapshot(golden_dir, {'normalized': reference_tables,
+                                                              'sqlite': reference_db_tables}, metadata)
+            elif golden_dir:
+                golden, golden_manifest = RegressionHarness.read_snapshot(golden_dir)
+                golden_source_hash = golden_manifest['metadata'].get('source_hash')
+                if metadata and golden_source_hash and golden_source_hash != metadata.get('source_hash'):
+                    raise ValueError(f"The golden snapshot in '{golden_dir}' was taken from a different source file. "
+                                     "Rerun with --update-golden if the new source file is intended.")
+                if RegressionHarness.same_pandas_release(golden_manifest.get('pandas_version')):
+                    results += RegressionHarness.compare_tables(golden['normalized'], reference_tables, dataset,
+                                                                'reference-vs-golden')
+                    results += RegressionHarness.compare_tables(golden['sqlite'], reference_db_tables, dataset,
+                                                                'reference-vs-golden (sqlite)')
+                else:
+                    # Text conversions of missing values differ between pandas releases (e.g. astype(str) of NaN)
+                    detail = (f"golden snapshot taken with pandas {golden_manifest.get('pandas_version')}, "
+                              f"running pandas {pd.__version__} (see requirements.txt)")
+                    logger.warning("\nSkipping the golden snapshot comparison: %s.", detail)
+                    results.append({'dataset': dataset, 'engine': 'reference-vs-golden', 'table': None,
+                                    'status': 'skipped', 'detail': detail})
+
+            for engine_name, engine in normalize_engines.items():
+                try:
+                    engine_tables = engine(raw_df)
+                except ImportError as error:
+                    results.append({'dataset': dataset, 'engine': engine_name, 'table': None,
+                                    'status': 'skipped', 'detail': str(error)})
+                    continue
+                results += RegressionHarness.compare_tables(reference_tables, engine_tables, dataset, engine_name)
+
+                engine_db_path = os.path.join(work_dir, f"{engine_name}.db")
+                RegressionHarness.load_reference(engine_tables, engine_db_path)
+                results += RegressionHarness.compare_tables(reference_db_tables,
+                                                            RegressionHarness.read_sqlite_tables(engine_db_path),
+                                                            dataset, f"{engine_name} (sqlite)")
+
+            for engine_name, engine in (original_engines or {}).items():
+                engine_tables = engine(raw_df)
+                results += RegressionHarness.compare_tables(RegressionHarness.without_surrogate_ids(reference_tables),
+                                                            RegressionHarness.without_surrogate_ids(engine_tables),
+                                                            dataset, engine_name)
+
+                engine_db_path = os.path.join(work_dir, f"{engine_name}.db")
+                RegressionHarness.load_reference(engine_tables, engine_db_path)
+                results += RegressionHarness.compare_tables(
+                    RegressionHarness.without_surrogate_ids(reference_db_tables),
+                    RegressionHarness.without_surrogate_ids(RegressionHarness.read_sqlite_tables(engine_db_path)),
+                    dataset, f"{engine_name} (sqlite)")
+
+            for engine_name, engine in load_engines.items():
+                engine_db_path = os.path.join(work_dir, f"{engine_name}.db")
+                engine(reference_tables, engine_db_path)
+                results += RegressionHarness.compare_tables(reference_db_tables,
+                                                            RegressionHarness.read_sqlite_tables(engine_db_path),
+                                                            dataset, f"{engine_name} (sqlite)")
+
+        return pd.DataFrame(results, columns=['dataset', 'engine', 'table', 'status', 'detail'])
+
+
+NORMALIZE_ENGINES = {
+    'partitioned-local': RegressionHarness.partitioned_engine('local'),
+    'partitioned-local-by-country': RegressionHarness.partitioned_engine('local', 2, 'country_name'),
+    'partitioned-processes': RegressionHarness.partitioned_engine('processes'),
+    'partitioned-dask': RegressionHarness.partitioned_engine('dask'),
+    'partitioned-ray': RegressionHarness.partitioned_engine('ray'),
+}
+
+LOAD_ENGINES = {
+    'chunked-load': RegressionHarness.chunked_load_engine(1000),
+}
+
+ORIGINAL_ENGINES = {
+    'original': OriginalPipeline.run,
+}
+
+
+def parse_arguments(argv=None):
+    """ Parse the regression harness command line options. """
+    arg_parser = argparse.ArgumentParser(description="Compare pipeline engines against the reference output.")
+    arg_parser.add_argument('--golden-dir', default=DEFAULT_GOLDEN_DIR,
+                            help="Golden snapshot of the reference output on the Belgium workbook.")
+    arg_parser.add_argument('--update-golden', action='store_true',
+                            help="Rewrite the golden snapshot from the current reference implementation.")
+    arg_parser.add_argument('--engines', default=None,
+                            help="Comma separated engine names to compare (default: all). Available: "
+                                 f"{', '.join([*NORMALIZE_ENGINES, *LOAD_ENGINES, *ORIGINAL_ENGINES])}.")
+    arg_parser.add_argument('--skip-workbook', action='store_true',
+                            help="Only run on synthetic data.")
+    arg_parser.add_argument('--synthetic-profiles', type=int, default=60,
+                            help="Number of synthetic profiles, 0 disables the synthetic data set.")
+    arg_parser.add_argument('--seed', type=int, default=0,
+                            help="Seed of the synthetic data.")
+    arg_parser.add_argument('--log-level', choices=LOG_LEVELS, default='WARNING',
+                            help="Log level of the pipeline steps run by the harness.")
+    return arg_parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    configure_logging(level=args.log_level)
+    # The harness reports at INFO regardless of the pipeline log level
+    logger.setLevel(logging.INFO)
+
+    selected = set(args.engines.split(',')) if args.engines else None
+    unknown = (selected or set()) - set(NORMALIZE_ENGINES) - set(LOAD_ENGINES) - set(ORIGINAL_ENGINES)
+    if unknown:
+        raise ValueError(f"Unknown engine(s): {sorted(unknown)}.")
+    normalize_engines = {name: engine for name, engine in NORMALIZE_ENGINES.items()
+                         if selected is None or name in selected}
+    load_engines = {name: engine for name, engine in LOAD_ENGINES.items() if selected is None or name in selected}
+    original_engines = {name: engine for name, engine in ORIGINAL_ENGINES.items()
+                        if selected is None or name in selected}
+
+    reports = []
+    if not args.skip_workbook:
+        source_path = DataExtraction.get_dataset_file_path(SOURCE_FILE_NAME)
+        raw_df = DataExtraction.read_raw_data(SOURCE_FILE_NAME)
+        reports.append(RegressionHarness.run(raw_df, 'belgium', normalize_engines, load_engines,
+                                             golden_dir=args.golden_dir, update_golden=args.update_golden,
+                                             metadata={'source_file': SOURCE_FILE_NAME,
+                                                       'source_hash': RunManifest.compute_file_hash(source_path)},
+                                             original_engines=original_engines))
+    if args.synthetic_profiles:
+        raw_df = RegressionHarness.synthetic_raw_data(args.synthetic_profiles, args.seed)
+        reports.append(RegressionHarness.run(raw_df, f"synthetic(seed={args.seed})", normalize_engines,
+                                             load_engines, original_engines=original_engines))
+
+    report = pd.concat(reports, ignore_index=True) if reports else pd.DataFrame()
+    with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 250,
+                           'display.max_colwidth', 80):
+        logger.info("\nRegression report:\n%s", report)
+
+    mismatches = report[report['status'] == 'mismatch'] if not report.empty else report
+    if not mismatches.empty:
+        logger.error("\n%s table comparison(s) differ from the reference.", len(mismatches))
+        return False
+    logger.info("\nAll engines match the reference output.")
+    return True
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main() else 1)
@@ -0,0 +1,101 @@
+# tests/test_data_loading.py
+
+import os
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from src.data_load.data_loading import DataLoading
+from src.regression_harness import RegressionHarness
+
+PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SQL_SCRIPT_PATH = os.path.join(PROJECT_DIRECTORY, 'initialize_db.sql')
+
+
+@pytest.fixture(scope='module')
+def normalized_tables():
+    return RegressionHarness.run_reference_pipeline(RegressionHarness.synthetic_raw_data(n_profiles=30, seed=5))
+
+
+def copy_tables(tables):
+    return {table_name: df.copy() for table_name, df in tables.items()}
+
+
+def table_row_counts(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {table_name: conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+                for table_name in ('orgc_method', 'orgc_profile', 'orgc_profile_layer', DataLoading.AGGREGATE_TABLE)}
+    finally:
+        conn.close()
+
+
+def test_plain_load_after_chunked_load(tmp_path, normalized_tables):
+    db_path = str(tmp_path / 'soil.db')
+
+    assert DataLoading.save_to_sqlite_chunked(copy_tables(normalized_tables), SQL_SCRIPT_PATH, file_name=db_path,
+                                              chunk_size=50)
+    assert DataLoading.save_depth_aggregates(file_name=db_path)
+    chunked_counts = table_row_counts(db_path)
+
+    assert DataLoading.save_to_sqlite(copy_tables(normalized_tables), SQL_SCRIPT_PATH, file_name=db_path)
+    assert DataLoading.save_depth_aggregates(file_name=db_path)
+    assert table_row_counts(db_path) == chunked_counts
+
+    # And back: the chunked load starts over on the plain load's tables
+    assert DataLoading.save_to_sqlite_chunked(copy_tables(normalized_tables), SQL_SCRIPT_PATH, file_name=db_path,
+                                              chunk_size=50)
+
+
+def test_unmatched_foreign_key_keeps_ids_exact(tmp_path, normalized_tables):
+    from src.data_load.columnar_store import ColumnarStore
+
+    tables = copy_tables(normalized_tables)
+    layer_df = tables['orgc_profile_layer_df']
+    layer_df['orgc_method_id'] = layer_df['orgc_method_id'].astype('Int64')
+    layer_df.loc[0, 'orgc_method_id'] = pd.NA
+    method_ids = set(tables['orgc_method_df']['id'])
+    profile_ids = set(tables['orgc_profile_df']['id'])
+
+    db_path = str(tmp_path / 'soil.db')
+    assert DataLoading.save_to_sqlite(copy_tables(tables), SQL_SCRIPT_PATH, file_name=db_path)
+    assert DataLoading.save_depth_aggregates(file_name=db_path)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        aggregate_keys = conn.execute(f"SELECT orgc_profile_id, orgc_method_id "
+                                      f"FROM {DataLoading.AGGREGATE_TABLE}").fetchall()
+        null_method_keys = conn.execute("SELECT COUNT(*) FROM orgc_profile_layer "
+                                        "WHERE orgc_method_id IS NULL").fetchone()[0]
+    finally:
+        conn.close()
+    assert null_method_keys == 1
+    assert {profile_id for profile_id, _ in aggregate_keys} <= profile_ids
+    assert {method_id for _, method_id in aggregate_keys if method_id is not None} <= method_ids
+
+    ColumnarStore.export_normalized(tables, str(tmp_path / 'columnar'))
+    exported = ColumnarStore.load_dataframe(str(tmp_path / 'columnar'), ['orgc_method_id'])['orgc_method_id']
+    assert set(exported.dropna().astype('int64')) <= method_ids
+    assert exported.isna().sum() == 1
+
+
+def test_plain_load_clears_interrupted_chunked_load(tmp_path, normalized_tables):
+    db_path = str(tmp_path / 'soil.db')
+    assert DataLoading.save_to_sqlite_chunked(copy_tables(normalized_tables), SQL_SCRIPT_PATH, file_name=db_path,
+                                              chunk_size=50)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        # As left behind by a crash between two chunks
+        conn.execute(f"UPDATE {DataLoading.LOAD_STATE_TABLE} SET status = 'in_progress'")
+        conn.commit()
+    finally:
+        conn.close()
+
+    assert DataLoading.save_to_sqlite(copy_tables(normalized_tables), SQL_SCRIPT_PATH, file_name=db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        assert DataLoading.get_load_state(conn) == {}
+    finally:
+        conn.close()
@@ -0,0 +1,24 @@
+# tests/test_data_preprocessing.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_preprocess_transform.data_preprocessing import DataPreprocessing
+
+
+@pytest.mark.parametrize('values', [
+    [1, '1', 1, 'x', None, np.nan],
+    [1, 1.0, True, '1'],
+    ['a', 'b', 'a'],
+    [1.5, 2.5, 1.5],
+])
+def test_drop_duplicates_matches_pandas(values):
+    df = pd.DataFrame({'value': pd.Series(values, dtype=object), 'key': 'k'})
+    expected = df.drop_duplicates().reset_index(drop=True)
+    pd.testing.assert_frame_equal(DataPreprocessing.drop_duplicates(df), expected)
+
+
+def test_drop_duplicates_unhashable_cells():
+    df = pd.DataFrame({'value': pd.Series([[1], [1], {2: 3}, '[1]'], dtype=object)})
+    assert DataPreprocessing.drop_duplicates(df)['value'].tolist() == [[1], {2: 3}, '[1]']
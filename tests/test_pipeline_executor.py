@@ -0,0 +1,48 @@
+# tests/test_pipeline_executor.py
+
+import pandas as pd
+import pytest
+
+from src.pipeline_executor import PartitionedExecutor
+from src.regression_harness import RegressionHarness
+
+
+@pytest.fixture(scope='module')
+def raw_df():
+    return RegressionHarness.synthetic_raw_data(n_profiles=40, seed=3)
+
+
+@pytest.fixture(scope='module')
+def local_result(raw_df):
+    return PartitionedExecutor(backend='local', n_partitions=3).run(raw_df)
+
+
+def assert_results_equal(expected, actual):
+    expected_tables, expected_date_issues, expected_preprocessed = expected
+    actual_tables, actual_date_issues, actual_preprocessed = actual
+
+    assert list(actual_tables) == list(expected_tables)
+    for table_name, table_df in expected_tables.items():
+        pd.testing.assert_frame_equal(actual_tables[table_name], table_df)
+    pd.testing.assert_frame_equal(actual_date_issues, expected_date_issues)
+    pd.testing.assert_frame_equal(actual_preprocessed, expected_preprocessed)
+
+
+def test_local_backend_matches_single_process(raw_df, local_result):
+    reference_tables = RegressionHarness.run_reference_pipeline(raw_df)
+    tables, _, df_preprocessed = local_result
+
+    for table_name, table_df in reference_tables.items():
+        pd.testing.assert_frame_equal(tables[table_name], table_df)
+    assert len(df_preprocessed) == len(reference_tables['orgc_profile_layer_df'])
+
+
+def test_dask_backend_matches_local(raw_df, local_result):
+    distributed = pytest.importorskip('dask.distributed')
+
+    with distributed.LocalCluster(processes=False, n_workers=2, threads_per_worker=1,
+                                  dashboard_address=None) as cluster:
+        executor = PartitionedExecutor(backend='dask', n_partitions=3, scheduler_address=cluster.scheduler_address)
+        dask_result = executor.run(raw_df)
+
+    assert_results_equal(local_result, dask_result)
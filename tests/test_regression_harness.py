@@ -0,0 +1,49 @@
+# tests/test_regression_harness.py
+
+import os
+
+import pandas as pd
+import pytest
+
+from src import regression_harness
+from src.regression_harness import RegressionHarness
+
+PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_engines_match_reference(monkeypatch):
+    # The harness resolves the workbook, SQL schema and golden snapshot from the project directory
+    monkeypatch.chdir(PROJECT_DIRECTORY)
+    # Engines against the reference only, the golden snapshot has its own test
+    assert regression_harness.main(['--golden-dir', '', '--synthetic-profiles', '40'])
+
+
+def test_reference_matches_golden_snapshot(monkeypatch):
+    monkeypatch.chdir(PROJECT_DIRECTORY)
+    _, manifest = RegressionHarness.read_snapshot(regression_harness.DEFAULT_GOLDEN_DIR)
+    if not RegressionHarness.same_pandas_release(manifest.get('pandas_version')):
+        pytest.skip(f"golden snapshot taken with pandas {manifest.get('pandas_version')}, "
+                    f"running pandas {pd.__version__} (see requirements.txt)")
+    assert regression_harness.main(['--engines', 'original', '--synthetic-profiles', '0'])
+
+
+def test_without_surrogate_ids_ignores_numbering_but_not_foreign_keys():
+    tables = {
+        'orgc_method_df': pd.DataFrame({'id': [1, 2], 'method_instance': [1, 2], 'detection': ['a', 'b']}),
+        'orgc_profile_layer_df': pd.DataFrame({'id': [1, 2, 3], 'profile_layer_id': [10, 11, 12],
+                                               'orgc_method_id': [1, 2, 2]}),
+    }
+    renumbered = {
+        'orgc_method_df': pd.DataFrame({'id': [902, 901], 'method_instance': [2, 1], 'detection': ['b', 'a']}),
+        'orgc_profile_layer_df': pd.DataFrame({'id': [7, 8, 9], 'profile_layer_id': [12, 10, 11],
+                                               'orgc_method_id': [902, 901, 902]}),
+    }
+    expected = RegressionHarness.without_surrogate_ids(tables)
+    results = RegressionHarness.compare_tables(expected, RegressionHarness.without_surrogate_ids(renumbered),
+                                               'test', 'renumbered')
+    assert [row['status'] for row in results] == ['match', 'match']
+
+    renumbered['orgc_profile_layer_df']['orgc_method_id'] = [902, 902, 901]
+    results = RegressionHarness.compare_tables(expected, RegressionHarness.without_surrogate_ids(renumbered),
+                                               'test', 'wrong foreign key')
+    assert [row['status'] for row in results] == ['match', 'mismatch']